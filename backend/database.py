@@ -1,7 +1,13 @@
-import psycopg2
-from psycopg2.extras import RealDictCursor
+import psycopg
+from psycopg import sql
+from psycopg.rows import dict_row
+from psycopg_pool import ConnectionPool
+from contextlib import contextmanager
+from datetime import datetime, timezone
+import threading
 import os
 from dotenv import load_dotenv
+from logger import logger
 
 # Load environment variables
 load_dotenv()
@@ -9,158 +15,652 @@ load_dotenv()
 # Database configuration
 DATABASE_CONFIG = {
     "host": os.getenv("POSTGRES_HOST", "localhost"),
-    "database": os.getenv("POSTGRES_DB", "job_analyzer"),
+    "dbname": os.getenv("POSTGRES_DB", "job_analyzer"),
     "user": os.getenv("POSTGRES_USER", "postgres"),
     "password": os.getenv("POSTGRES_PASSWORD", "postgres"),
     "port": int(os.getenv("POSTGRES_PORT", "5432"))
 }
 
-def get_db_connection():
+# Columns written by save_jobs_to_db, in COPY order
+JOB_COLUMNS = (
+    "id", "title", "company", "location", "salary_min", "salary_max",
+    "salary_avg", "description", "skills", "skills_count", "original_url",
+    "posted_date"
+)
+
+# Columns returned by get_jobs_from_db unless the caller asks for more
+JOB_SUMMARY_COLUMNS = ("id", "title", "company", "location", "salary_min", "salary_max")
+
+# Every column of a job, including the long description
+JOB_DETAIL_COLUMNS = JOB_COLUMNS + ("created_date",)
+
+# Columns with precomputed per-value job counts (mv_<column>_counts)
+COUNTED_COLUMNS = ("company", "location")
+
+# Connection pool, created on first use and shared by all requests
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool():
     """
-    Create and return a connection to PostgreSQL database
+    Return the shared connection pool, creating it on first call
     """
-    try:
-        conn = psycopg2.connect(**DATABASE_CONFIG, cursor_factory=RealDictCursor)
-        return conn
-    except Exception as e:
-        print(f"Error connecting to database: {e}")
-        return None
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                try:
+                    # Fail fast when the database is unreachable instead of
+                    # letting the pool retry in the background
+                    psycopg.connect(**DATABASE_CONFIG).close()
+                    _pool = ConnectionPool(
+                        min_size=2,
+                        max_size=20,
+                        kwargs={
+                            **DATABASE_CONFIG,
+                            "row_factory": dict_row,
+                            # Prepare repeated queries server-side right away
+                            "prepare_threshold": 1
+                        },
+                        open=True
+                    )
+                except Exception as e:
+                    logger.error("Error connecting to database: %s", e)
+                    return None
+    return _pool
+
+
+@contextmanager
+def get_conn():
+    """
+    Borrow a connection from the pool and give it back afterwards.
+    The transaction is committed on success and rolled back on error.
+    Yields None if the database is unreachable.
+    """
+    pool = get_pool()
+    if pool is None:
+        yield None
+        return
     
+    with pool.connection() as conn:
+        yield conn
+
+
+def close_pool():
+    """
+    Close all pooled connections (called on application shutdown)
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+
+
 def create_tables():
     """
     Create tables in PostgreSQL if they don't exist
     """
-    conn = get_db_connection()
-    if not conn:
-        return
-    
-    try:
-        cur = conn.cursor()
-        
-        # Create jobs table
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS jobs (
-                id VARCHAR(50) PRIMARY KEY,
-                title VARCHAR(255),
-                company VARCHAR(255),
-                location VARCHAR(255),
-                salary_min INTEGER,
-                salary_max INTEGER,
-                salary_avg INTEGER,
-                description TEXT,
-                skills TEXT,
-                skills_count INTEGER,
-                original_url TEXT,
-                created_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
+    with get_conn() as conn:
+        if not conn:
+            return
         
-        conn.commit()
-        print("Tables created successfully!")
+        try:
+            with conn.cursor() as cur:
+                # Create jobs table
+                cur.execute("""
+                    CREATE TABLE IF NOT EXISTS jobs (
+                        id VARCHAR(50) PRIMARY KEY,
+                        title VARCHAR(255),
+                        company VARCHAR(255),
+                        location VARCHAR(255),
+                        salary_min INTEGER,
+                        salary_max INTEGER,
+                        salary_avg INTEGER,
+                        description TEXT,
+                        skills TEXT[],
+                        skills_count INTEGER,
+                        original_url TEXT,
+                        created_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                """)
+                
+                # Older tables stored skills as a comma-separated string
+                cur.execute("""
+                    DO $$
+                    BEGIN
+                        IF EXISTS (
+                            SELECT 1 FROM information_schema.columns
+                            WHERE table_name = 'jobs' AND column_name = 'skills'
+                                AND data_type = 'text'
+                        ) THEN
+                            ALTER TABLE jobs ALTER COLUMN skills TYPE TEXT[]
+                                USING string_to_array(NULLIF(skills, ''), ',');
+                        END IF;
+                    END $$
+                """)
+                cur.execute("CREATE INDEX IF NOT EXISTS idx_jobs_skills ON jobs USING gin (skills)")
+                
+                # When the job was posted on Adzuna (created_date is when we stored it)
+                cur.execute("ALTER TABLE jobs ADD COLUMN IF NOT EXISTS posted_date TIMESTAMP")
+                
+                # Skills are counted from the stored skills array, not a stemmed text vector
+                cur.execute("DROP INDEX IF EXISTS idx_jobs_description_tsv")
+                cur.execute("ALTER TABLE jobs DROP COLUMN IF EXISTS description_tsv")
+                
+                # Remote flag derived once at write time instead of per query
+                cur.execute("""
+                    ALTER TABLE jobs ADD COLUMN IF NOT EXISTS is_remote BOOLEAN
+                    GENERATED ALWAYS AS (
+                        coalesce(title ILIKE '%remote%' OR description ILIKE '%remote%'
+                            OR location ILIKE '%remote%', false)
+                    ) STORED
+                """)
+                cur.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_jobs_remote_recent
+                    ON jobs (created_date DESC) WHERE is_remote
+                """)
+                
+                # B-tree indexes for the common filter and grouping columns
+                cur.execute("CREATE INDEX IF NOT EXISTS idx_jobs_company ON jobs (company)")
+                cur.execute("CREATE INDEX IF NOT EXISTS idx_jobs_salary ON jobs (salary_min, salary_max)")
+                
+                # Location filters are unanchored ILIKE '%...%' matches that only
+                # the trigram index can serve; drop b-trees older tables still have
+                cur.execute("DROP INDEX IF EXISTS idx_jobs_location")
+                cur.execute("DROP INDEX IF EXISTS idx_jobs_location_prefix")
+                
+                # Precomputed unfiltered counts, refreshed after each /refresh.
+                # The unique indexes allow REFRESH ... CONCURRENTLY.
+                cur.execute("""
+                    CREATE MATERIALIZED VIEW IF NOT EXISTS mv_skill_counts AS
+                    SELECT s.skill, COUNT(*)::int AS count
+                    FROM jobs, unnest(skills) AS s(skill)
+                    GROUP BY s.skill
+                """)
+                cur.execute("""
+                    CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_skill_counts
+                    ON mv_skill_counts (skill)
+                """)
+                # Job total from the same refresh, so skill percentages stay consistent
+                cur.execute("""
+                    CREATE MATERIALIZED VIEW IF NOT EXISTS mv_job_count AS
+                    SELECT 1 AS id, COUNT(*)::int AS total
+                    FROM jobs
+                """)
+                cur.execute("""
+                    CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_job_count
+                    ON mv_job_count (id)
+                """)
+                for column in COUNTED_COLUMNS:
+                    cur.execute(f"""
+                        CREATE MATERIALIZED VIEW IF NOT EXISTS mv_{column}_counts AS
+                        SELECT {column}, COUNT(*)::int AS job_count
+                        FROM jobs
+                        WHERE {column} IS NOT NULL AND {column} <> '' AND {column} <> 'Unknown'
+                        GROUP BY {column}
+                    """)
+                    cur.execute(f"""
+                        CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_{column}_counts
+                        ON mv_{column}_counts ({column})
+                    """)
+            
+            logger.info("Tables created successfully!")
+            
+        except Exception:
+            logger.exception("Error creating tables")
+            return
         
-    except Exception as e:
-        print(f"Error creating tables: {e}")
-    finally:
-        cur.close()
-        conn.close()    
+        # Trigram indexes let ILIKE '%keyword%' use an index instead of a
+        # sequential scan. Run in a savepoint so a missing pg_trgm extension
+        # doesn't roll back the table itself.
+        try:
+            with conn.transaction(), conn.cursor() as cur:
+                cur.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+                cur.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_jobs_title_trgm
+                    ON jobs USING gin (title gin_trgm_ops)
+                """)
+                cur.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_jobs_desc_trgm
+                    ON jobs USING gin (description gin_trgm_ops)
+                """)
+                cur.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_jobs_loc_trgm
+                    ON jobs USING gin (location gin_trgm_ops)
+                """)
+            
+            logger.info("Search indexes created successfully!")
+            
+        except Exception as e:
+            logger.warning("Could not create search indexes: %s", e)
 
 
-def save_jobs_to_db(jobs):
+def _to_int(value):
     """
-    Save cleaned jobs to PostgreSQL database
+    Coerce a numeric value to int, returning None when it isn't one
+    """
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_timestamp(value):
+    """
+    Parse an ISO 8601 timestamp as naive UTC, returning None when it isn't one
     """
-    conn = get_db_connection()
-    if not conn:
-        return 0
-    
     try:
-        cur = conn.cursor()
-        saved_count = 0
+        timestamp = datetime.fromisoformat(value) if value else None
+    except (TypeError, ValueError):
+        return None
+    if timestamp and timestamp.tzinfo:
+        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return timestamp
+
+
+def _to_text(value, max_length=None):
+    """
+    Coerce a value to text Postgres accepts (no NUL bytes), truncated to max_length.
+    None stays None, so it is stored as NULL.
+    """
+    if value is None:
+        return None
+    return str(value).replace('\x00', '')[:max_length]
+
+
+def _job_row(job):
+    """
+    Convert a cleaned job dict into a tuple in JOB_COLUMNS order.
+    Values are coerced to fit the column types so one odd job can't fail
+    the whole batch.
+    """
+    # Skills are stored as a text array
+    skills = job.get('skills', [])
+    if isinstance(skills, list):
+        skills = [_to_text(s) for s in skills]
+    else:
+        skills = [s for s in (_to_text(skills) or '').split(',') if s]
+    
+    # Ensure all values are strings or integers (not dicts), within column sizes
+    return (
+        _to_text(job.get("id", ""), 50),
+        _to_text(job.get("title", ""), 255),
+        _to_text(job.get("company", "Unknown"), 255),
+        _to_text(job.get("location", "Unknown"), 255),
+        _to_int(job.get("salary_min")),
+        _to_int(job.get("salary_max")),
+        _to_int(job.get("salary_avg")),
+        _to_text(job.get("description", "")),
+        skills,
+        _to_int(job.get("skills_count", 0)),
+        _to_text(job.get("original_url", "")),
+        _to_timestamp(job.get("posted_date"))
+    )
+
+
+def save_jobs_to_db(jobs):
+    """
+    Save cleaned jobs to PostgreSQL database.
+    jobs can be any iterable (e.g. the process_jobs generator); rows are
+    streamed to the server as they are produced.
+    """
+    with get_conn() as conn:
+        if not conn:
+            return 0
         
-        for job in jobs:
-            try:
-                # Convert skills list to comma-separated string
-                skills = job.get('skills', [])
-                if isinstance(skills, list):
-                    skills_str = ','.join(str(s) for s in skills)
-                else:
-                    skills_str = str(skills)
+        try:
+            with conn.cursor() as cur:
+                # Stream rows through COPY into a staging table, then move them over
+                # with a single INSERT ... SELECT so duplicates are still skipped.
+                # Jobs stored before posted_date existed get it filled in.
+                cur.execute("""
+                    CREATE TEMP TABLE jobs_stage (LIKE jobs INCLUDING DEFAULTS) ON COMMIT DROP
+                """)
                 
-                # Ensure all values are strings or integers (not dicts)
-                job_id = str(job.get("id", ""))
-                title = str(job.get("title", ""))
-                company = str(job.get("company", "Unknown"))
-                location = str(job.get("location", "Unknown"))
-                description = str(job.get("description", ""))
-                original_url = str(job.get("original_url", ""))
+                columns = ', '.join(JOB_COLUMNS)
+                with cur.copy(f"COPY jobs_stage ({columns}) FROM STDIN") as copy:
+                    for job in jobs:
+                        copy.write_row(_job_row(job))
                 
-                cur.execute("""
-                    INSERT INTO jobs (id, title, company, location, salary_min, salary_max, 
-                                    salary_avg, description, skills, skills_count, original_url)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    ON CONFLICT (id) DO NOTHING
-                """, (
-                    job_id,
-                    title,
-                    company,
-                    location,
-                    job.get("salary_min"),
-                    job.get("salary_max"),
-                    job.get("salary_avg"),
-                    description,
-                    skills_str,
-                    job.get("skills_count", 0),
-                    original_url
-                ))
-                saved_count += 1
-            except Exception as e:
-                print(f"Error saving job {job.get('id')}: {e}")
-                continue
+                cur.execute(f"""
+                    INSERT INTO jobs ({columns})
+                    SELECT {columns} FROM jobs_stage
+                    ON CONFLICT (id) DO UPDATE SET posted_date = EXCLUDED.posted_date
+                    WHERE jobs.posted_date IS NULL AND EXCLUDED.posted_date IS NOT NULL
+                """)
+                saved_count = cur.rowcount
+            
+            return saved_count
+            
+        except Exception as e:
+            # For COPY errors the context names the offending input line
+            context = getattr(getattr(e, "diag", None), "context", None)
+            logger.exception("Error saving jobs (context: %s)", context)
+            return 0
+
+
+def get_existing_job_ids(job_ids):
+    """
+    Return the subset of job_ids already stored, in one query.
+    Jobs still missing their posting date are left out, so a refresh
+    saves them again and backfills it.
+    """
+    try:
+        rows = _fetch_all(
+            "SELECT id FROM jobs WHERE id = ANY(%s) AND posted_date IS NOT NULL",
+            ([str(i) for i in job_ids],)
+        )
+        return {row["id"] for row in rows}
+        
+    except Exception:
+        logger.exception("Error looking up existing jobs")
+        raise
+
+
+def analyze_jobs():
+    """
+    Refresh planner statistics for the jobs table after a bulk load
+    """
+    with get_conn() as conn:
+        if not conn:
+            return
         
-        conn.commit()
-        return saved_count
+        try:
+            conn.execute("ANALYZE jobs")
+        except Exception:
+            logger.exception("Error analyzing jobs table")
+
+
+def refresh_count_views():
+    """
+    Recompute the materialized count views after new jobs are saved
+    """
+    with get_conn() as conn:
+        if not conn:
+            return
         
-    except Exception as e:
-        print(f"Error saving jobs: {e}")
-        return 0
-    finally:
-        cur.close()
-        conn.close()
+        try:
+            # One transaction, so readers see all views from the same refresh
+            views = ("mv_skill_counts", "mv_job_count", *(f"mv_{column}_counts" for column in COUNTED_COLUMNS))
+            for view in views:
+                conn.execute(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {view}")
+        except Exception:
+            logger.exception("Error refreshing count views")
 
 
-def get_jobs_from_db(keyword=None, location=None, limit=100):
+def _job_filters(keyword=None, location=None, min_salary=None, max_salary=None):
     """
-    Retrieve jobs from PostgreSQL database with optional filters
+    Build the shared WHERE clause and parameters for job queries
     """
-    conn = get_db_connection()
-    if not conn:
-        return []
+    query = " WHERE 1=1"
+    params = []
+    
+    if keyword:
+        query += " AND (title ILIKE %s OR description ILIKE %s)"
+        params.extend([f"%{keyword}%", f"%{keyword}%"])
+    
+    if location:
+        query += " AND location ILIKE %s"
+        params.append(f"%{location}%")
+    
+    if min_salary:
+        query += " AND salary_min >= %s"
+        params.append(min_salary)
     
+    if max_salary:
+        query += " AND salary_min <= %s"
+        params.append(max_salary)
+    
+    return query, params
+
+
+def _fetch_all(query, params=()):
+    """
+    Run a read query on a pooled connection and return all rows.
+    Raises if the database is unreachable.
+    """
+    with get_conn() as conn:
+        if not conn:
+            raise psycopg.OperationalError("Database is unreachable")
+        with conn.cursor() as cur:
+            cur.execute(query, params)
+            return cur.fetchall()
+
+
+def get_jobs_from_db(keyword=None, location=None, limit=100, min_salary=None, max_salary=None,
+                     columns=JOB_SUMMARY_COLUMNS):
+    """
+    Retrieve jobs from PostgreSQL database with optional filters.
+    Only the given columns are selected, so the description is left out
+    unless a caller asks for it.
+    """
     try:
-        cur = conn.cursor()
+        where, params = _job_filters(keyword, location, min_salary, max_salary)
+        query = sql.SQL("SELECT {columns} FROM jobs{where} LIMIT %s").format(
+            columns=sql.SQL(', ').join(map(sql.Identifier, columns)),
+            where=sql.SQL(where)
+        )
+        params.append(int(limit))
+        return _fetch_all(query, params)
         
-        # Build query with filters
-        query = "SELECT * FROM jobs WHERE 1=1"
-        params = []
+    except Exception:
+        logger.exception("Error retrieving jobs")
+        raise
+
+
+def iter_jobs_from_db(keyword=None, location=None, *, min_salary=None, max_salary=None,
+                      columns=JOB_DETAIL_COLUMNS, limit=None, batch_size=500):
+    """
+    Stream jobs matching the filters through a server-side cursor.
+    Rows are fetched batch_size at a time, so memory stays bounded however
+    many jobs match. Errors are raised, even mid-stream, so a partial result
+    never looks complete.
+    """
+    try:
+        where, params = _job_filters(keyword, location, min_salary, max_salary)
+        query = sql.SQL("SELECT {columns} FROM jobs{where}").format(
+            columns=sql.SQL(', ').join(map(sql.Identifier, columns)),
+            where=sql.SQL(where)
+        )
+        if limit is not None:
+            query += sql.SQL(" LIMIT %s")
+            params.append(int(limit))
+        with get_conn() as conn:
+            if not conn:
+                raise psycopg.OperationalError("Database is unreachable")
+            with conn.cursor(name="jobs_stream") as cur:
+                cur.itersize = batch_size
+                cur.execute(query, params)
+                yield from cur
+                
+    except Exception:
+        logger.exception("Error streaming jobs")
+        raise
+
+
+def get_job_from_db(job_id):
+    """
+    Retrieve a single job by its primary key, or None if it doesn't exist.
+    Database errors are raised, so an outage isn't mistaken for a missing job.
+    """
+    try:
+        query = sql.SQL("SELECT {columns} FROM jobs WHERE id = %s").format(
+            columns=sql.SQL(', ').join(map(sql.Identifier, JOB_DETAIL_COLUMNS))
+        )
+        rows = _fetch_all(query, (str(job_id),))
+        return rows[0] if rows else None
         
-        if keyword:
-            query += " AND (title ILIKE %s OR description ILIKE %s)"
-            params.extend([f"%{keyword}%", f"%{keyword}%"])
+    except Exception:
+        logger.exception("Error retrieving job %s", job_id)
+        raise
+
+
+def get_remote_jobs_from_db(keyword=None, limit=10):
+    """
+    Retrieve the newest jobs mentioning remote work in the title, description
+    or location. The partial index on remote jobs serves this without a scan.
+    """
+    try:
+        where, params = _job_filters(keyword)
+        query = sql.SQL(
+            "SELECT {columns} FROM jobs{where} AND is_remote ORDER BY created_date DESC LIMIT %s"
+        ).format(
+            columns=sql.SQL(', ').join(map(sql.Identifier, JOB_DETAIL_COLUMNS)),
+            where=sql.SQL(where)
+        )
+        return _fetch_all(query, params + [int(limit)])
         
-        if location:
-            query += " AND location ILIKE %s"
-            params.append(f"%{location}%")
+    except Exception:
+        logger.exception("Error retrieving remote jobs")
+        raise
+
+
+def get_salary_stats_sql(keyword=None, location=None):
+    """
+    Calculate min/max/average/median salary over matching jobs in one query.
+    Both salary_min and salary_max count as salary data points.
+    """
+    try:
+        where, params = _job_filters(keyword, location)
+        query = """
+            SELECT
+                COUNT(DISTINCT id) AS jobs_analyzed,
+                MIN(s.salary) AS min_salary,
+                MAX(s.salary) AS max_salary,
+                FLOOR(AVG(s.salary))::int AS average_salary,
+                (PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY s.salary))::int AS median_salary
+            FROM jobs
+            LEFT JOIN LATERAL (VALUES (salary_min), (salary_max)) AS s(salary)
+                ON s.salary > 0
+        """ + where
+        rows = _fetch_all(query, params)
+        return rows[0] if rows else None
+        
+    except Exception:
+        logger.exception("Error calculating salary stats")
+        raise
+
+
+def _count_by(column, keyword=None, location=None, limit=10):
+    """
+    Count jobs per value of a column, most common first.
+    Returns (rows, total distinct values).
+    """
+    # Unfiltered counts are precomputed in a materialized view
+    if not keyword and not location:
+        rows = _fetch_all(f"""
+            SELECT {column}, job_count, COUNT(*) OVER () AS total
+            FROM mv_{column}_counts
+            ORDER BY job_count DESC, {column}
+            LIMIT %s
+        """, (limit,))
+    else:
+        where, params = _job_filters(keyword, location)
+        rows = _fetch_all(f"""
+            SELECT {column}, COUNT(*)::int AS job_count, COUNT(*) OVER () AS total
+            FROM jobs {where}
+                AND {column} IS NOT NULL AND {column} <> '' AND {column} <> 'Unknown'
+            GROUP BY {column}
+            ORDER BY job_count DESC, {column}
+            LIMIT %s
+        """, params + [limit])
+    total = rows[0]["total"] if rows else 0
+    return [{column: row[column], "job_count": row["job_count"]} for row in rows], total
+
+
+def get_skill_counts(limit=20):
+    """
+    Count how many jobs list each skill, most common first.
+    Returns (rows, total jobs), both as of the last view refresh.
+    """
+    try:
+        rows = _fetch_all("""
+            SELECT s.skill, s.count, j.total
+            FROM mv_skill_counts s CROSS JOIN mv_job_count j
+            ORDER BY count DESC, skill
+            LIMIT %s
+        """, (limit,))
+        total = rows[0]["total"] if rows else 0
+        return [{"skill": row["skill"], "count": row["count"]} for row in rows], total
         
-        query += f" LIMIT {limit}"
+    except Exception:
+        logger.exception("Error counting skills")
+        raise
+
+
+def count_skills(skills, keyword=None, location=None):
+    """
+    Count matching jobs whose stored skills array contains each skill, so a
+    skill matches exactly as the ETL extracted it. Returns ({skill: count}, total jobs).
+    """
+    try:
+        where, params = _job_filters(keyword, location)
+        counts = [
+            sql.SQL("COUNT(*) FILTER (WHERE skills @> ARRAY[%s]::text[])::int AS {}")
+            .format(sql.Identifier(f"skill_{i}"))
+            for i in range(len(skills))
+        ]
+        query = sql.SQL("SELECT COUNT(*)::int AS total, {counts} FROM jobs{where}").format(
+            counts=sql.SQL(', ').join(counts),
+            where=sql.SQL(where)
+        )
+        rows = _fetch_all(query, list(skills) + params)
+        if not rows:
+            return {}, 0
         
-        cur.execute(query, params)
-        jobs = cur.fetchall()
+        row = rows[0]
+        return {skill: row[f"skill_{i}"] for i, skill in enumerate(skills)}, row["total"]
         
-        return jobs
+    except Exception:
+        logger.exception("Error counting skills for keyword %s", keyword)
+        raise
+
+
+def get_company_counts(keyword=None, location=None, limit=10):
+    """
+    Get companies posting the most jobs as (rows, total companies)
+    """
+    try:
+        return _count_by("company", keyword, location, limit)
+    except Exception:
+        logger.exception("Error counting companies")
+        raise
+
+
+def get_location_counts(keyword=None, limit=10):
+    """
+    Get locations with the most jobs as (rows, total locations)
+    """
+    try:
+        return _count_by("location", keyword, limit=limit)
+    except Exception:
+        logger.exception("Error counting locations")
+        raise
+
+
+# Bucket sizes accepted by get_job_timeseries
+TIMESERIES_INTERVALS = ("day", "week", "month")
+
+
+def get_job_timeseries(keyword=None, location=None, interval="day"):
+    """
+    Count matching jobs per day, week or month they were posted, oldest first.
+    Jobs without a posting date are left out.
+    """
+    if interval not in TIMESERIES_INTERVALS:
+        raise ValueError(f"interval must be one of {', '.join(TIMESERIES_INTERVALS)}")
+    
+    try:
+        where, params = _job_filters(keyword, location)
+        query = f"""
+            SELECT date_trunc(%s, posted_date)::date AS date, COUNT(*)::int AS job_count
+            FROM jobs {where} AND posted_date IS NOT NULL
+            GROUP BY 1
+            ORDER BY 1
+        """
+        return _fetch_all(query, [interval] + params)
         
-    except Exception as e:
-        print(f"Error retrieving jobs: {e}")
-        return []
-    finally:
-        cur.close()
-        conn.close()
\ No newline at end of file
+    except Exception:
+        logger.exception("Error counting jobs over time")
+        raise
@@ -1,6 +1,14 @@
 import re
-from typing import List, Dict
+import ahocorasick
+from typing import List, Dict, Iterator, Tuple
 from collections import Counter
+from logger import logger
+
+# Patterns used by clean_html, compiled once
+_TAG_RE = re.compile(r'<[^>]+>')
+_WS_RE = re.compile(r'\s+')
+_PUNCT_RE = re.compile(r'[^\w\s.,!?-]')
+
 
 def clean_html(text: str) -> str:
     """
@@ -9,85 +17,105 @@ def clean_html(text: str) -> str:
     if not text:
         return ""
     
-    # Remove HTML tags
-    text = re.sub(r'<[^>]+>', '', text)
+    # Remove HTML tags (skip the scan when there can't be any)
+    if '<' in text:
+        text = _TAG_RE.sub('', text)
     
     # Remove extra whitespace
-    text = re.sub(r'\s+', ' ', text)
+    text = _WS_RE.sub(' ', text)
     
     # Remove special characters but keep basic punctuation
-    text = re.sub(r'[^\w\s.,!?-]', '', text)
+    text = _PUNCT_RE.sub('', text)
     
     return text.strip()
 
 
+# Comprehensive skills list
+ALL_SKILLS = {
+    'python', 'sql', 'r', 'java', 'javascript', 'scala', 'c++',
+    'aws', 'azure', 'gcp', 'google cloud', 'cloud',
+    'docker', 'kubernetes', 'jenkins', 'ci/cd', 'git', 'github', 'linux',
+    'spark', 'hadoop', 'kafka', 'airflow', 'databricks',
+    'tableau', 'powerbi', 'power bi', 'looker', 'qlik',
+    'excel', 'pandas', 'numpy', 'scipy', 'matplotlib', 'seaborn',
+    'tensorflow', 'pytorch', 'keras', 'scikit-learn', 'sklearn',
+    'machine learning', 'deep learning', 'nlp', 'computer vision', 'ai',
+    'statistics', 'a/b testing',
+    'fastapi', 'flask', 'django', 'streamlit',
+    'postgresql', 'mysql', 'mongodb', 'redis', 'elasticsearch',
+    'api', 'rest', 'etl', 'data pipeline', 'data warehouse'
+}
+
+def build_skill_automaton(skills) -> ahocorasick.Automaton:
+    """
+    Build an Aho-Corasick automaton over lowercase skill names. One C-level
+    pass over the text then finds every occurrence, including overlapping
+    ones such as 'google cloud' and 'cloud'.
+    """
+    automaton = ahocorasick.Automaton()
+    for skill in skills:
+        automaton.add_word(skill, skill)
+    automaton.make_automaton()
+    return automaton
+
+
+_SKILL_AUTOMATON = build_skill_automaton(ALL_SKILLS)
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == '_'
+
+
+def find_skills(text: str, automaton: ahocorasick.Automaton = _SKILL_AUTOMATON) -> List[str]:
+    """
+    Find skills occurring as whole words in text, lowercase and de-duplicated
+    """
+    text = text.lower()
+    last = len(text) - 1
+    
+    # dict.fromkeys keeps the first occurrence order while de-duplicating
+    return list(dict.fromkeys(
+        skill for end, skill in automaton.iter(text)
+        if (end == last or not _is_word_char(text[end + 1]))
+        and (end < len(skill) or not _is_word_char(text[end - len(skill)]))
+    ))
+
+
 def extract_skills(description: str, title: str) -> List[str]:
     """
     Extract technical skills from job description and title
     """
-    # Comprehensive skills list
-    all_skills = {
-        'python', 'sql', 'r', 'java', 'javascript', 'scala', 'c++',
-        'aws', 'azure', 'gcp', 'google cloud', 'cloud',
-        'docker', 'kubernetes', 'jenkins', 'ci/cd', 'git', 'github',
-        'spark', 'hadoop', 'kafka', 'airflow', 'databricks',
-        'tableau', 'powerbi', 'power bi', 'looker', 'qlik',
-        'excel', 'pandas', 'numpy', 'scipy', 'matplotlib', 'seaborn',
-        'tensorflow', 'pytorch', 'keras', 'scikit-learn', 'sklearn',
-        'machine learning', 'deep learning', 'nlp', 'computer vision', 'ai',
-        'fastapi', 'flask', 'django', 'streamlit',
-        'postgresql', 'mysql', 'mongodb', 'redis', 'elasticsearch',
-        'api', 'rest', 'etl', 'data pipeline', 'data warehouse'
-    }
-    
-    combined_text = f"{description} {title}".lower()
-    
-    found_skills = []
-    for skill in all_skills:
-        if skill in combined_text:
-            found_skills.append(skill)
-    
-    return found_skills
+    return find_skills(f"{description} {title}")
 
 
 def remove_duplicates(jobs: List[Dict]) -> List[Dict]:
     """
-    Remove duplicate jobs based on ID
+    Remove duplicate jobs based on ID (jobs without an ID are dropped)
     """
-    seen_ids = set()
-    unique_jobs = []
-    
-    for job in jobs:
-        job_id = job.get('id')
-        if job_id and job_id not in seen_ids:
-            seen_ids.add(job_id)
-            unique_jobs.append(job)
-    
-    return unique_jobs
+    # A dict keyed by ID de-duplicates in one pass and keeps first-seen order
+    return list({job['id']: job for job in jobs if job.get('id')}.values())
 
 
-def standardize_salary(salary_min: int, salary_max: int) -> Dict:
+def standardize_salary(salary_min: int, salary_max: int) -> Tuple[int, int, int]:
     """
-    Standardize and validate salary data
+    Standardize and validate salary data, returning (min, max, average)
     """
+    # Most postings have no salary at all
+    if not salary_min and not salary_max:
+        return 0, 0, 0
+    
     # Handle None values
-    if not salary_min:
-        salary_min = 0
-    if not salary_max:
-        salary_max = 0
+    salary_min = salary_min or 0
+    salary_max = salary_max or 0
     
     # Ensure min is less than max
-    if salary_min > salary_max and salary_max > 0:
+    if salary_min > salary_max > 0:
         salary_min, salary_max = salary_max, salary_min
     
     # Calculate average if both exist
     avg_salary = (salary_min + salary_max) // 2 if (salary_min and salary_max) else (salary_min or salary_max)
     
-    return {
-        'salary_min': salary_min,
-        'salary_max': salary_max,
-        'salary_avg': avg_salary
-    }
+    return salary_min, salary_max, avg_salary
 
 
 def clean_location(location_data: Dict) -> str:
@@ -116,20 +144,18 @@ def transform_job(job: Dict) -> Dict:
     """
     Apply all transformations to a single job
     """
-    # Extract raw data
+    # Extract raw data (a missing title or URL becomes '')
     raw_description = job.get('description', '')
-    raw_title = job.get('title', '')
+    raw_title = job.get('title') or ''
     raw_location = job.get('location', {})
     raw_company = job.get('company', {})
-    salary_min = job.get('salary_min')
-    salary_max = job.get('salary_max')
     
     # Clean and transform
     clean_desc = clean_html(raw_description)
     skills = extract_skills(clean_desc, raw_title)
     location = clean_location(raw_location)
     company = clean_company(raw_company)
-    salary_data = standardize_salary(salary_min, salary_max)
+    salary_min, salary_max, salary_avg = standardize_salary(job.get('salary_min'), job.get('salary_max'))
     
     # Build cleaned job object
     cleaned_job = {
@@ -137,36 +163,40 @@ def transform_job(job: Dict) -> Dict:
         'title': raw_title,
         'company': company,
         'location': location,
-        'salary_min': salary_data['salary_min'],
-        'salary_max': salary_data['salary_max'],
-        'salary_avg': salary_data['salary_avg'],
+        'salary_min': salary_min,
+        'salary_max': salary_max,
+        'salary_avg': salary_avg,
         'description': clean_desc,
         'skills': skills,
         'skills_count': len(skills),
-        'original_url': job.get('redirect_url', '')
+        'original_url': job.get('redirect_url') or '',
+        'posted_date': job.get('created')
     }
     
     return cleaned_job
 
 
-def process_jobs(jobs: List[Dict]) -> List[Dict]:
+def process_jobs(jobs: List[Dict]) -> Iterator[Dict]:
     """
-    Main ETL function: Clean and transform all jobs
+    Main ETL function: Clean and transform all jobs.
+    Yields cleaned jobs so they can be streamed into the database.
     """
     # Remove duplicates
     unique_jobs = remove_duplicates(jobs)
     
-    # Transform each job
-    cleaned_jobs = []
-    for job in unique_jobs:
+    yield from _transform_each(unique_jobs)
+
+
+def _transform_each(jobs: List[Dict]) -> Iterator[Dict]:
+    """
+    Transform jobs one at a time, skipping any that fail
+    """
+    for job in jobs:
         try:
-            cleaned_job = transform_job(job)
-            cleaned_jobs.append(cleaned_job)
-        except Exception as e:
-            print(f"Error transforming job {job.get('id')}: {e}")
+            yield transform_job(job)
+        except Exception:
+            logger.exception("Error transforming job %s", job.get('id'))
             continue
-    
-    return cleaned_jobs
 
 
 def get_skill_statistics(jobs: List[Dict]) -> Dict:
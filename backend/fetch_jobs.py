@@ -1,16 +1,69 @@
-import requests
+import asyncio
+import math
+import httpx
 import os
 from dotenv import load_dotenv
+from logger import logger
 
 load_dotenv()
 APP_ID = os.getenv("ADZUNA_APP_ID")
 API_KEY = os.getenv("ADZUNA_API_KEY")
 
-def fetch_jobs_from_adzuna(keyword="data scientist", location="us", results_per_page=10):
+# Adzuna caps results_per_page, larger requests are split into pages
+MAX_RESULTS_PER_PAGE = 50
+
+# Retry transient gateway errors with exponential backoff
+RETRY_STATUSES = {502, 503, 504}
+MAX_RETRIES = 3
+BACKOFF_FACTOR = 0.3
+
+# Shared client so TCP/TLS connections to Adzuna are reused across refreshes
+_client = None
+
+def get_client():
+    """
+    Return the shared HTTP client, creating it on first use
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=10,
+            transport=httpx.AsyncHTTPTransport(
+                retries=MAX_RETRIES,  # connection errors
+                limits=httpx.Limits(max_connections=16, max_keepalive_connections=4)
+            )
+        )
+    return _client
+
+
+async def close_client():
+    """
+    Close the shared HTTP client (called on application shutdown)
+    """
+    if _client is not None:
+        await _client.aclose()
+
+
+async def _get_page(url, params):
+    """
+    GET one results page, retrying on gateway errors
     """
-    Fetch real job data from Adzuna API
+    for attempt in range(MAX_RETRIES + 1):
+        response = await get_client().get(url, params=params)
+        if response.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+            return response
+        await asyncio.sleep(BACKOFF_FACTOR * 2 ** attempt)
+
+
+async def fetch_jobs_from_adzuna(keyword="data scientist", location="us", results=10):
     """
-    url = f"https://api.adzuna.com/v1/api/jobs/{location}/search/1"
+    Fetch real job data from Adzuna API, requesting all pages concurrently
+    """
+    if results <= 0:
+        return []
+    
+    results_per_page = min(results, MAX_RESULTS_PER_PAGE)
+    pages = math.ceil(results / results_per_page)
     params = {
         "app_id": APP_ID,
         "app_key": API_KEY,
@@ -18,10 +71,21 @@ def fetch_jobs_from_adzuna(keyword="data scientist", location="us", results_per_
         "results_per_page": results_per_page
     }
 
-    response = requests.get(url, params=params)
+    # A page that fails (e.g. times out) is skipped like a non-200 page,
+    # so it doesn't throw away the pages that succeeded
+    responses = await asyncio.gather(*[
+        _get_page(f"https://api.adzuna.com/v1/api/jobs/{location}/search/{page}", params)
+        for page in range(1, pages + 1)
+    ], return_exceptions=True)
 
-    if response.status_code == 200:
-        data = response.json()
-        return data.get("results", [])
-    else:
-        return []
+    failed = [response for response in responses if isinstance(response, Exception)]
+    if failed and len(failed) == len(responses):
+        raise failed[0]
+
+    jobs = []
+    for page, response in enumerate(responses, start=1):
+        if isinstance(response, Exception):
+            logger.warning("Skipping Adzuna page %s: %r", page, response)
+        elif response.status_code == 200:
+            jobs.extend(response.json().get("results", []))
+    return jobs[:results]
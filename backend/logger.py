@@ -1,4 +1,5 @@
 import logging
+from logging.handlers import RotatingFileHandler
 from datetime import datetime
 import os
 
@@ -6,6 +7,9 @@ import os
 if not os.path.exists('logs'):
     os.makedirs('logs')
 
+# Log level, e.g. LOG_LEVEL=DEBUG to include raw payload samples
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+
 # Configure logging
 def setup_logger():
     """
@@ -13,7 +17,14 @@ def setup_logger():
     """
     # Create logger
     logger = logging.getLogger('job_analyzer')
-    logger.setLevel(logging.INFO)
+    
+    # Already configured (module re-imported, e.g. by uvicorn --reload or pytest)
+    if logger.handlers:
+        return logger
+    
+    logger.setLevel(LOG_LEVEL)
+    # Don't emit every record a second time through the root logger
+    logger.propagate = False
     
     # Create formatters
     formatter = logging.Formatter(
@@ -23,13 +34,13 @@ def setup_logger():
     
     # Console handler (prints to terminal)
     console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.INFO)
+    console_handler.setLevel(LOG_LEVEL)
     console_handler.setFormatter(formatter)
     
-    # File handler (writes to file)
+    # File handler (writes to file, rotated at 10 MB keeping 5 backups)
     log_filename = f'logs/app_{datetime.now().strftime("%Y%m%d")}.log'
-    file_handler = logging.FileHandler(log_filename)
-    file_handler.setLevel(logging.INFO)
+    file_handler = RotatingFileHandler(log_filename, maxBytes=10_000_000, backupCount=5)
+    file_handler.setLevel(LOG_LEVEL)
     file_handler.setFormatter(formatter)
     
     # Add handlers to logger
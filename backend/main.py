@@ -1,14 +1,86 @@
-from fastapi import FastAPI, HTTPException
-from fetch_jobs import fetch_jobs_from_adzuna
-from database import save_jobs_to_db, get_jobs_from_db, create_tables
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse, JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from pydantic import BaseModel
+from typing import List
+from cachetools import TTLCache
+from functools import wraps
+import threading
+import itertools
+import hashlib
+import orjson
+from fetch_jobs import fetch_jobs_from_adzuna, close_client
+from database import (
+    save_jobs_to_db, get_existing_job_ids, get_jobs_from_db, JOB_DETAIL_COLUMNS,
+    create_tables, close_pool, analyze_jobs, refresh_count_views,
+    get_job_from_db, get_remote_jobs_from_db, iter_jobs_from_db,
+    get_salary_stats_sql, get_skill_counts, get_company_counts, get_location_counts,
+    get_job_timeseries, TIMESERIES_INTERVALS
+)
 from etl import process_jobs
 from logger import logger
-from ml_models.predict import predict_salary, get_model_stats
+from ml_models.predict import predict_salary, predict_salaries, unknown_features, get_model_stats
 from ml_models.predict_category import predict_job_category
 from ml_models.skill_recommender import get_skill_recommendations
 from ml_models.market_analyzer import analyze_market
 
-app = FastAPI(title="Job Analyzer API")
+class OrjsonResponse(JSONResponse):
+    """JSON response rendered with orjson, which is several times faster than json"""
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+app = FastAPI(title="Job Analyzer API", default_response_class=OrjsonResponse)
+
+# Aggregates only change on /refresh, so serve repeats from memory
+_AGG_CACHE = TTLCache(maxsize=256, ttl=300)
+_AGG_CACHE_LOCK = threading.Lock()
+
+def cached_aggregate(func):
+    """
+    Cache an endpoint's response per query parameters until TTL or /refresh.
+    Errors propagate uncached, so a database outage isn't served for the TTL.
+    """
+    @wraps(func)
+    def wrapper(**kwargs):
+        key = (func.__name__, *sorted(kwargs.items()))
+        with _AGG_CACHE_LOCK:
+            if key in _AGG_CACHE:
+                return _AGG_CACHE[key]
+        
+        result = func(**kwargs)
+        with _AGG_CACHE_LOCK:
+            _AGG_CACHE[key] = result
+        return result
+    return wrapper
+
+# Bumped whenever /refresh changes the data, so ETags change with it
+_data_version = 0
+
+@app.middleware("http")
+async def etag_middleware(request: Request, call_next):
+    """Tag JSON GET responses with an ETag and answer 304 when it matches"""
+    response = await call_next(request)
+    if (request.method != "GET" or response.status_code != 200
+            or response.headers.get("content-type") != "application/json"):
+        return response
+    
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    digest = hashlib.blake2b(body, digest_size=8).hexdigest()
+    # Weak, because GZipMiddleware may send these same contents gzipped
+    etag = f'W/"{_data_version}-{digest}"'
+    
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers={"ETag": etag})
+    
+    headers = dict(response.headers)
+    headers["ETag"] = etag
+    return Response(content=body, status_code=response.status_code, headers=headers)
+
+# Compress larger responses for clients that accept gzip. Added after the
+# ETag middleware so it wraps it, and ETags are taken on the plain body.
+app.add_middleware(GZipMiddleware, minimum_size=1024)
 
 @app.on_event("startup")
 async def startup_event():
@@ -17,6 +89,13 @@ async def startup_event():
     create_tables()
     logger.info("Database tables verified")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release pooled database and HTTP connections"""
+    close_pool()
+    await close_client()
+    logger.info("Connection pools closed")
+
 @app.get("/")
 def read_root():
     logger.info("Root endpoint accessed")
@@ -31,12 +110,12 @@ def health_check():
 def get_jobs(keyword: str = None, location: str = None, limit: int = 100):
     """Get jobs from PostgreSQL database"""
     try:
-        logger.info(f"Fetching jobs - keyword: {keyword}, location: {location}, limit: {limit}")
-        jobs = get_jobs_from_db(keyword, location, limit)
-        logger.info(f"Successfully retrieved {len(jobs)} jobs")
+        logger.info("Fetching jobs - keyword: %s, location: %s, limit: %s", keyword, location, limit)
+        jobs = get_jobs_from_db(keyword, location, limit, columns=JOB_DETAIL_COLUMNS)
+        logger.info("Successfully retrieved %s jobs", len(jobs))
         return {"jobs": jobs, "count": len(jobs)}
     except Exception as e:
-        logger.error(f"Error fetching jobs: {str(e)}")
+        logger.error("Error fetching jobs: %s", e)
         raise HTTPException(status_code=500, detail="Error retrieving jobs from database")
 
 @app.get("/jobs/search")
@@ -49,214 +128,207 @@ def search_jobs(
 ):
     """Search jobs from database with filters"""
     try:
-        logger.info(f"Searching jobs - keyword: {keyword}, salary: {min_salary}-{max_salary}")
-        jobs = get_jobs_from_db(keyword, location, limit=100)
-        
-        filtered_jobs = []
-        for job in jobs:
-            salary = job.get("salary_min", 0)
-            
-            if min_salary and salary < min_salary:
-                continue
-            if max_salary and salary > max_salary:
-                continue
-                
-            filtered_jobs.append(job)
-            if len(filtered_jobs) >= limit:
-                break
+        logger.info("Searching jobs - keyword: %s, salary: %s-%s", keyword, min_salary, max_salary)
+        jobs = get_jobs_from_db(keyword, location, limit, min_salary, max_salary,
+                                columns=JOB_DETAIL_COLUMNS)
         
-        logger.info(f"Found {len(filtered_jobs)} jobs matching criteria")
-        return {"jobs": filtered_jobs, "count": len(filtered_jobs)}
+        logger.info("Found %s jobs matching criteria", len(jobs))
+        return {"jobs": jobs, "count": len(jobs)}
     except Exception as e:
-        logger.error(f"Error searching jobs: {str(e)}")
+        logger.error("Error searching jobs: %s", e)
         raise HTTPException(status_code=500, detail="Error searching jobs")
 
+@app.get("/jobs/timeseries")
+@cached_aggregate
+def get_jobs_timeseries(keyword: str = None, location: str = None, interval: str = "day"):
+    """Get the number of jobs posted per day, week or month"""
+    if interval not in TIMESERIES_INTERVALS:
+        raise HTTPException(status_code=400, detail=f"interval must be one of {', '.join(TIMESERIES_INTERVALS)}")
+    
+    try:
+        logger.info("Counting jobs over time - keyword: %s, interval: %s", keyword, interval)
+        points = get_job_timeseries(keyword, location, interval)
+        return {"interval": interval, "points": points}
+    except Exception as e:
+        logger.error("Error counting jobs over time: %s", e)
+        raise HTTPException(status_code=500, detail="Error counting jobs over time")
+
+@app.get("/jobs/export")
+def export_jobs(
+    keyword: str = None,
+    location: str = None,
+    min_salary: int = None,
+    max_salary: int = None
+):
+    """Stream all matching jobs as newline-delimited JSON"""
+    logger.info("Exporting jobs - keyword: %s, location: %s", keyword, location)
+    try:
+        rows = iter_jobs_from_db(keyword, location, min_salary=min_salary, max_salary=max_salary)
+        # Run the query and fetch the first batch before streaming starts, so
+        # connection errors get an error status rather than an empty 200
+        first = next(rows, None)
+    except Exception as e:
+        logger.error("Error exporting jobs: %s", e)
+        raise HTTPException(status_code=500, detail="Error exporting jobs")
+    
+    # A failure later on aborts the stream instead of ending it cleanly
+    rows = itertools.chain([first] if first is not None else [], rows)
+    lines = (orjson.dumps(row) + b"\n" for row in rows)
+    return StreamingResponse(lines, media_type="application/x-ndjson")
+
 @app.get("/skills/top")
+@cached_aggregate
 def get_top_skills(limit: int = 20):
     """Get most in-demand skills from database"""
     try:
-        logger.info(f"Fetching top {limit} skills")
-        jobs = get_jobs_from_db(limit=200)
-        
-        skills_list = [
-            "python", "sql", "r", "java", "javascript", "aws", "azure", "gcp",
-            "docker", "kubernetes", "spark", "hadoop", "tableau", "powerbi",
-            "excel", "pandas", "numpy", "tensorflow", "pytorch", "scikit-learn",
-            "git", "machine learning", "deep learning", "nlp", "computer vision"
-        ]
-        
-        skill_counts = {}
-        for skill in skills_list:
-            skill_counts[skill] = 0
-        
-        for job in jobs:
-            description = str(job.get("description", "")).lower()
-            title = str(job.get("title", "")).lower()
-            
-            for skill in skills_list:
-                if skill in description or skill in title:
-                    skill_counts[skill] += 1
-        
-        sorted_skills = sorted(skill_counts.items(), key=lambda x: x[1], reverse=True)
-        top_skills = [{"skill": skill, "count": count} for skill, count in sorted_skills[:limit]]
+        logger.info("Fetching top %s skills", limit)
+        top_skills, total_jobs = get_skill_counts(limit)
         
-        logger.info(f"Successfully calculated top {limit} skills")
-        return {"skills": top_skills, "total_jobs_analyzed": len(jobs)}
+        logger.info("Successfully calculated top %s skills", limit)
+        return {"skills": top_skills, "total_jobs_analyzed": total_jobs}
     except Exception as e:
-        logger.error(f"Error calculating top skills: {str(e)}")
+        logger.error("Error calculating top skills: %s", e)
         raise HTTPException(status_code=500, detail="Error calculating skills")
 
 @app.get("/salaries/stats")
+@cached_aggregate
 def get_salary_stats(keyword: str = None, location: str = None):
     """Get salary statistics from database"""
     try:
-        logger.info(f"Calculating salary stats - keyword: {keyword}, location: {location}")
-        jobs = get_jobs_from_db(keyword, location, limit=200)
+        logger.info("Calculating salary stats - keyword: %s, location: %s", keyword, location)
+        row = get_salary_stats_sql(keyword, location)
         
-        salaries = []
-        for job in jobs:
-            if job.get("salary_min"):
-                salaries.append(job.get("salary_min"))
-            if job.get("salary_max"):
-                salaries.append(job.get("salary_max"))
-        
-        if not salaries:
+        if not row or row["min_salary"] is None:
             logger.warning("No salary data available")
             return {"message": "No salary data available"}
         
-        salaries.sort()
-        count = len(salaries)
-        
         stats = {
             "keyword": keyword or "all",
             "location": location or "all",
-            "min_salary": min(salaries),
-            "max_salary": max(salaries),
-            "average_salary": sum(salaries) // count,
-            "median_salary": salaries[count // 2],
-            "jobs_analyzed": len(jobs)
+            "min_salary": row["min_salary"],
+            "max_salary": row["max_salary"],
+            "average_salary": row["average_salary"],
+            "median_salary": row["median_salary"],
+            "jobs_analyzed": row["jobs_analyzed"]
         }
         
-        logger.info(f"Salary stats calculated: avg ${stats['average_salary']}")
+        logger.info("Salary stats calculated: avg $%s", stats['average_salary'])
         return stats
     except Exception as e:
-        logger.error(f"Error calculating salary stats: {str(e)}")
+        logger.error("Error calculating salary stats: %s", e)
         raise HTTPException(status_code=500, detail="Error calculating salary statistics")
 
 @app.get("/companies/hiring")
+@cached_aggregate
 def get_top_companies(keyword: str = None, location: str = None, limit: int = 10):
     """Get companies posting the most jobs from database"""
     try:
-        logger.info(f"Fetching top {limit} hiring companies")
-        jobs = get_jobs_from_db(keyword, location, limit=200)
-        
-        company_counts = {}
-        for job in jobs:
-            company = job.get("company", "Unknown")
-            if company and company != "Unknown":
-                company_counts[company] = company_counts.get(company, 0) + 1
+        logger.info("Fetching top %s hiring companies", limit)
+        top_companies, total_companies = get_company_counts(keyword, location, limit)
         
-        sorted_companies = sorted(company_counts.items(), key=lambda x: x[1], reverse=True)
-        top_companies = [{"company": comp, "job_count": count} for comp, count in sorted_companies[:limit]]
-        
-        logger.info(f"Found {len(top_companies)} companies")
-        return {"companies": top_companies, "total_companies": len(company_counts)}
+        logger.info("Found %s companies", len(top_companies))
+        return {"companies": top_companies, "total_companies": total_companies}
     except Exception as e:
-        logger.error(f"Error fetching top companies: {str(e)}")
+        logger.error("Error fetching top companies: %s", e)
         raise HTTPException(status_code=500, detail="Error fetching companies")
 
 @app.get("/locations/best")
+@cached_aggregate
 def get_best_locations(keyword: str = None, limit: int = 10):
     """Get locations with most job opportunities from database"""
     try:
-        logger.info(f"Fetching top {limit} locations")
-        jobs = get_jobs_from_db(keyword, limit=200)
-        
-        location_counts = {}
-        for job in jobs:
-            location = job.get("location", "Unknown")
-            if location and location != "Unknown":
-                location_counts[location] = location_counts.get(location, 0) + 1
-        
-        sorted_locations = sorted(location_counts.items(), key=lambda x: x[1], reverse=True)
-        top_locations = [{"location": loc, "job_count": count} for loc, count in sorted_locations[:limit]]
+        logger.info("Fetching top %s locations", limit)
+        top_locations, total_locations = get_location_counts(keyword, limit)
         
-        logger.info(f"Found {len(top_locations)} locations")
-        return {"locations": top_locations, "total_locations": len(location_counts)}
+        logger.info("Found %s locations", len(top_locations))
+        return {"locations": top_locations, "total_locations": total_locations}
     except Exception as e:
-        logger.error(f"Error fetching locations: {str(e)}")
+        logger.error("Error fetching locations: %s", e)
         raise HTTPException(status_code=500, detail="Error fetching locations")
 
 @app.get("/jobs/{job_id}")
 def get_job_by_id(job_id: str):
     """Get details for a specific job by ID from database"""
     try:
-        logger.info(f"Fetching job with ID: {job_id}")
-        jobs = get_jobs_from_db(limit=1000)
+        logger.info("Fetching job with ID: %s", job_id)
+        job = get_job_from_db(job_id)
         
-        for job in jobs:
-            if str(job.get("id")) == str(job_id):
-                logger.info(f"Job {job_id} found")
-                return {"job": job}
+        if job:
+            logger.info("Job %s found", job_id)
+            return {"job": job}
         
-        logger.warning(f"Job {job_id} not found")
+        logger.warning("Job %s not found", job_id)
         raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error fetching job {job_id}: {str(e)}")
+        logger.error("Error fetching job %s: %s", job_id, e)
         raise HTTPException(status_code=500, detail="Error fetching job details")
 
 @app.get("/remote")
+@cached_aggregate
 def get_remote_jobs(keyword: str = None, limit: int = 10):
     """Get remote job opportunities from database"""
     try:
-        logger.info(f"Fetching remote jobs - keyword: {keyword}")
-        jobs = get_jobs_from_db(keyword, limit=200)
+        logger.info("Fetching remote jobs - keyword: %s", keyword)
+        remote_jobs = get_remote_jobs_from_db(keyword, limit)
         
-        remote_jobs = []
-        for job in jobs:
-            title = str(job.get("title", "")).lower()
-            description = str(job.get("description", "")).lower()
-            location = str(job.get("location", "")).lower()
-            
-            if "remote" in title or "remote" in description or "remote" in location:
-                remote_jobs.append(job)
-                if len(remote_jobs) >= limit:
-                    break
-        
-        logger.info(f"Found {len(remote_jobs)} remote jobs")
+        logger.info("Found %s remote jobs", len(remote_jobs))
         return {"jobs": remote_jobs, "count": len(remote_jobs)}
     except Exception as e:
-        logger.error(f"Error fetching remote jobs: {str(e)}")
+        logger.error("Error fetching remote jobs: %s", e)
         raise HTTPException(status_code=500, detail="Error fetching remote jobs")
 
 @app.post("/refresh")
-def refresh_jobs(keyword: str = "data", location: str = "us", results: int = 50):
+async def refresh_jobs(keyword: str = "data", location: str = "us", results: int = 50):
     """Fetch, clean, transform, and save jobs to database"""
     try:
-        logger.info(f"Starting job refresh - keyword: {keyword}, location: {location}, results: {results}")
+        logger.info("Starting job refresh - keyword: %s, location: %s, results: %s", keyword, location, results)
         
         # Fetch from Adzuna
-        raw_jobs = fetch_jobs_from_adzuna(keyword, location, results)
-        logger.info(f"Fetched {len(raw_jobs)} raw jobs from Adzuna")
-        
-        # ETL - Clean and transform
-        cleaned_jobs = process_jobs(raw_jobs)
-        logger.info(f"Cleaned {len(cleaned_jobs)} jobs through ETL")
-        
-        # Save to PostgreSQL
-        saved_count = save_jobs_to_db(cleaned_jobs)
-        logger.info(f"Saved {saved_count} jobs to database")
+        raw_jobs = await fetch_jobs_from_adzuna(keyword, location, results)
+        logger.info("Fetched %s raw jobs from Adzuna", len(raw_jobs))
+        if raw_jobs:
+            logger.debug("Raw job sample: %s", raw_jobs[0])
+        
+        # Only run ETL on jobs we don't already have
+        existing_ids = await run_in_threadpool(
+            get_existing_job_ids, [job['id'] for job in raw_jobs if job.get('id')]
+        )
+        new_jobs = [job for job in raw_jobs if str(job.get('id')) not in existing_ids]
+        logger.info("Skipping %s jobs already in database", len(raw_jobs) - len(new_jobs))
+        
+        # ETL - Clean and transform, streamed straight into PostgreSQL
+        cleaned_count = 0
+        
+        def count_cleaned(jobs):
+            nonlocal cleaned_count
+            for job in jobs:
+                cleaned_count += 1
+                yield job
+        
+        saved_count = await run_in_threadpool(save_jobs_to_db, count_cleaned(process_jobs(new_jobs)))
+        logger.info("Cleaned %s jobs through ETL", cleaned_count)
+        logger.info("Saved %s jobs to database", saved_count)
+        
+        # Keep planner statistics and precomputed counts fresh after bulk loads
+        if saved_count:
+            await run_in_threadpool(analyze_jobs)
+            await run_in_threadpool(refresh_count_views)
+            with _AGG_CACHE_LOCK:
+                _AGG_CACHE.clear()
+            global _data_version
+            _data_version += 1
         
         return {
             "message": "Jobs refreshed with ETL processing",
             "fetched": len(raw_jobs),
-            "cleaned": len(cleaned_jobs),
+            "existing": len(raw_jobs) - len(new_jobs),
+            "cleaned": cleaned_count,
             "saved": saved_count
         }
     except Exception as e:
-        logger.error(f"Error refreshing jobs: {str(e)}")
+        logger.error("Error refreshing jobs: %s", e)
         raise HTTPException(status_code=500, detail=f"Error refreshing jobs: {str(e)}")
 
 
@@ -266,17 +338,49 @@ def predict_job_salary(title: str, location: str, company: str = "Unknown"):
     Predict salary for a job using ML model
     """
     try:
-        logger.info(f"Predicting salary for: {title} at {company} in {location}")
+        logger.info("Predicting salary for: %s at %s in %s", title, company, location)
         result = predict_salary(title, location, company)
         
         if "error" in result:
-            logger.error(f"Prediction error: {result['error']}")
+            logger.error("Prediction error: %s", result['error'])
             raise HTTPException(status_code=400, detail=result['error'])
         
-        logger.info(f"Predicted salary: ${result['predicted_salary']:,.2f}")
+        logger.info("Predicted salary: $%.2f", result['predicted_salary'])
         return result
     except Exception as e:
-        logger.error(f"Error in salary prediction: {str(e)}")
+        logger.error("Error in salary prediction: %s", e)
+        raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
+
+
+class SalaryPredictionRequest(BaseModel):
+    title: str
+    location: str
+    company: str = "Unknown"
+
+@app.post("/ml/predict-salary/batch")
+def predict_job_salaries(jobs: List[SalaryPredictionRequest]):
+    """
+    Predict salaries for many jobs in a single model call
+    """
+    try:
+        logger.info("Predicting salaries for %s jobs", len(jobs))
+        if not jobs:
+            return {"predictions": [], "count": 0}
+        
+        rows = [(job.title, job.location, job.company) for job in jobs]
+        salaries = predict_salaries(rows)
+        
+        predictions = [
+            {
+                **job.model_dump(),
+                "predicted_salary": round(float(salary), 2),
+                "unknown_features": unknown_features(row)
+            }
+            for job, row, salary in zip(jobs, rows, salaries)
+        ]
+        return {"predictions": predictions, "count": len(predictions)}
+    except Exception as e:
+        logger.error("Error in batch salary prediction: %s", e)
         raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
 
 
@@ -290,12 +394,12 @@ def get_salary_model_info():
         stats = get_model_stats()
         
         if "error" in stats:
-            logger.error(f"Model stats error: {stats['error']}")
+            logger.error("Model stats error: %s", stats['error'])
             raise HTTPException(status_code=500, detail=stats['error'])
         
         return stats
     except Exception as e:
-        logger.error(f"Error fetching model stats: {str(e)}")
+        logger.error("Error fetching model stats: %s", e)
         raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
     
 @app.post("/ml/classify-job")
@@ -304,17 +408,17 @@ def classify_job(title: str, description: str = ""):
     Predict job category using ML model
     """
     try:
-        logger.info(f"Classifying job: {title}")
+        logger.info("Classifying job: %s", title)
         result = predict_job_category(title, description)
         
         if "error" in result:
-            logger.error(f"Classification error: {result['error']}")
+            logger.error("Classification error: %s", result['error'])
             raise HTTPException(status_code=400, detail=result['error'])
         
-        logger.info(f"Predicted category: {result['predicted_category']}")
+        logger.info("Predicted category: %s", result['predicted_category'])
         return result
     except Exception as e:
-        logger.error(f"Error in classification: {str(e)}")
+        logger.error("Error in classification: %s", e)
         raise HTTPException(status_code=500, detail=f"Classification failed: {str(e)}")
     
 @app.get("/ml/recommend-skills")
@@ -323,34 +427,34 @@ def recommend_skills(target_role: str = "data scientist", top_n: int = 10):
     Recommend skills to learn for a target job role
     """
     try:
-        logger.info(f"Getting skill recommendations for: {target_role}")
+        logger.info("Getting skill recommendations for: %s", target_role)
         result = get_skill_recommendations(target_role, top_n)
         
         if "error" in result:
-            logger.error(f"Recommendation error: {result['error']}")
+            logger.error("Recommendation error: %s", result['error'])
             raise HTTPException(status_code=400, detail=result['error'])
         
-        logger.info(f"Found {len(result['recommended_skills'])} skills")
+        logger.info("Found %s skills", len(result['recommended_skills']))
         return result
     except Exception as e:
-        logger.error(f"Error in skill recommendations: {str(e)}")
+        logger.error("Error in skill recommendations: %s", e)
         raise HTTPException(status_code=500, detail=f"Recommendation failed: {str(e)}")
     
 @app.get("/ml/market-analysis")
-def get_market_analysis(keyword: str = "data scientist"):
+async def get_market_analysis(keyword: str = "data scientist"):
     """
     Analyze job market for a given role
     """
     try:
-        logger.info(f"Analyzing market for: {keyword}")
-        result = analyze_market(keyword)
+        logger.info("Analyzing market for: %s", keyword)
+        result = await analyze_market(keyword)
         
         if "error" in result:
-            logger.error(f"Market analysis error: {result['error']}")
+            logger.error("Market analysis error: %s", result['error'])
             raise HTTPException(status_code=400, detail=result['error'])
         
-        logger.info(f"Market analysis complete: {result['total_jobs']} jobs found")
+        logger.info("Market analysis complete: %s jobs found", result['total_jobs'])
         return result
     except Exception as e:
-        logger.error(f"Error in market analysis: {str(e)}")
+        logger.error("Error in market analysis: %s", e)
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
\ No newline at end of file
@@ -1,70 +1,83 @@
 import sys
 sys.path.append('..')
-from database import get_jobs_from_db
+import psycopg
+from database import iter_jobs_from_db, get_salary_stats_sql, get_company_counts
+from etl import build_skill_automaton, find_skills
 from datetime import datetime
+import asyncio
+import heapq
 
-def analyze_market(keyword: str = "data scientist"):
+# Skills tracked in the market analysis
+SKILL_LIST = ["python", "sql", "aws", "machine learning", "docker",
+              "tensorflow", "spark", "tableau", "r", "java"]
+
+# Automaton over all skills, built once so each job's text is scanned once
+SKILL_AUTOMATON = build_skill_automaton(SKILL_LIST)
+
+def _scan_jobs(keyword):
+    """
+    Stream every job for a keyword, counting how many mention each skill
+    (each skill once per job) in a single pass
+    """
+    jobs = iter_jobs_from_db(
+        keyword=keyword,
+        columns=('title', 'description'), batch_size=100
+    )
+    skill_counts = {skill: 0 for skill in SKILL_LIST}
+    
+    for job in jobs:
+        text = (job.get('title') or '') + ' ' + (job.get('description') or '')
+        for skill in find_skills(text, SKILL_AUTOMATON):
+            skill_counts[skill] += 1
+    
+    return skill_counts
+
+async def analyze_market(keyword: str = "data scientist"):
     """
     Analyze current job market for a given role
     
     Returns: job count, salary stats, top skills, top companies
     """
     try:
-        # Step 1: Get jobs for this keyword
-        jobs = get_jobs_from_db(keyword=keyword, limit=500)
+        # Step 1: Scan jobs for skills while the database computes salary
+        # and company aggregates; each runs on its own pooled connection.
+        # All three cover every job matching the keyword.
+        skill_counts, row, (companies, _) = await asyncio.gather(
+            asyncio.to_thread(_scan_jobs, keyword),
+            asyncio.to_thread(get_salary_stats_sql, keyword),
+            asyncio.to_thread(get_company_counts, keyword, limit=5)
+        )
         
-        if not jobs:
+        total_jobs = row["jobs_analyzed"] if row else 0
+        if not total_jobs:
             return {"error": f"No jobs found for '{keyword}'"}
         
-        # Step 2: Calculate salary statistics
-        salaries = []
-        for job in jobs:
-            if job.get('salary_min') and job.get('salary_min') > 0:
-                salaries.append(job['salary_min'])
-            if job.get('salary_max') and job.get('salary_max') > 0:
-                salaries.append(job['salary_max'])
-        
+        # Step 2: Shape salary statistics
         salary_stats = {}
-        if salaries:
+        if row and row["min_salary"] is not None:
             salary_stats = {
-                "min": min(salaries),
-                "max": max(salaries),
-                "average": round(sum(salaries) / len(salaries), 2),
-                "median": sorted(salaries)[len(salaries) // 2]
+                "min": row["min_salary"],
+                "max": row["max_salary"],
+                "average": row["average_salary"],
+                "median": row["median_salary"]
             }
         
-        # Step 3: Count top skills
-        skill_list = ["python", "sql", "aws", "machine learning", "docker", 
-                      "tensorflow", "spark", "tableau", "r", "java"]
-        skill_counts = {skill: 0 for skill in skill_list}
-        
-        for job in jobs:
-            text = (job.get('title', '') + ' ' + job.get('description', '')).lower()
-            for skill in skill_list:
-                if skill in text:
-                    skill_counts[skill] += 1
-        
-        top_skills = sorted(skill_counts.items(), key=lambda x: x[1], reverse=True)[:5]
-        
-        # Step 4: Count top companies
-        company_counts = {}
-        for job in jobs:
-            company = job.get('company', 'Unknown')
-            if company and company != 'Unknown':
-                company_counts[company] = company_counts.get(company, 0) + 1
-        
-        top_companies = sorted(company_counts.items(), key=lambda x: x[1], reverse=True)[:5]
+        # Step 3: Pick top skills (nlargest keeps a 5-item heap instead of sorting)
+        top_skills = heapq.nlargest(5, skill_counts.items(), key=lambda x: x[1])
         
-        # Step 5: Build response
+        # Step 4: Build response
         return {
             "keyword": keyword,
-            "total_jobs": len(jobs),
+            "total_jobs": total_jobs,
             "analysis_date": datetime.now().strftime("%Y-%m-%d"),
             "salary_stats": salary_stats,
             "top_skills": [{"skill": s, "count": c} for s, c in top_skills],
-            "top_companies": [{"company": c, "jobs": n} for c, n in top_companies],
-            "market_summary": f"Found {len(jobs)} {keyword} jobs with average salary ${salary_stats.get('average', 'N/A'):,}"
+            "top_companies": [{"company": c["company"], "jobs": c["job_count"]} for c in companies],
+            "market_summary": f"Found {total_jobs} {keyword} jobs with average salary ${salary_stats.get('average', 'N/A'):,}"
         }
     
+    except psycopg.Error:
+        # Database failures are server errors, not a bad request
+        raise
     except Exception as e:
         return {"error": str(e)}
\ No newline at end of file
@@ -1,13 +1,41 @@
 import pickle
+import numpy as np
 import pandas as pd
 import os
+import threading
+import itertools
+from functools import lru_cache
 
 # Get the directory where this file is located
 MODEL_DIR = os.path.dirname(os.path.abspath(__file__))
 
+# Features the salary model is trained on, in column order
+FEATURES = ('title', 'location', 'company')
+
+# Column names the model was fitted with (see train_salary_model.py)
+FEATURE_COLUMNS = tuple(f"{feature}_encoded" for feature in FEATURES)
+
+# Model and feature maps, loaded from disk on first use and shared by all requests
+_model = None
+_feature_maps = None
+_model_lock = threading.Lock()
+
 def load_model():
     """
-    Load the trained model and label encoders
+    Load the trained model and feature maps, reading the pickles only once
+    """
+    global _model, _feature_maps
+    
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                _model, _feature_maps = _read_model()
+    
+    return _model, _feature_maps
+
+def _read_model():
+    """
+    Read the trained model and feature maps ({value: code} per feature) from disk
     """
     model_path = os.path.join(MODEL_DIR, 'salary_model.pkl')
     encoders_path = os.path.join(MODEL_DIR, 'label_encoders.pkl')
@@ -18,7 +46,62 @@ def load_model():
     with open(encoders_path, 'rb') as f:
         label_encoders = pickle.load(f)
     
-    return model, label_encoders
+    # Older models saved fitted LabelEncoders; turn them into plain dict lookups
+    feature_maps = {
+        feature: (
+            {cls: code for code, cls in enumerate(encoder.classes_)}
+            if hasattr(encoder, 'classes_') else encoder
+        )
+        for feature, encoder in label_encoders.items()
+    }
+    
+    return model, feature_maps
+
+def _candidate_codes(feature_map, value):
+    """
+    Codes to predict with for one feature value: its own code when seen in
+    training, otherwise every known code
+    """
+    code = feature_map.get(str(value))
+    return [code] if code is not None else list(feature_map.values())
+
+def unknown_features(row):
+    """
+    Return the features of a (title, location, company) row not seen in training
+    """
+    _, feature_maps = load_model()
+    return [feature for feature, value in zip(FEATURES, row) if str(value) not in feature_maps[feature]]
+
+def predict_salaries(rows):
+    """
+    Predict salaries for many jobs in one model call
+    
+    Args:
+        rows (list): (title, location, company) tuples
+    
+    Returns:
+        np.ndarray: Predicted salary per row
+    """
+    model, feature_maps = load_model()
+    
+    # The model only knows the codes it was trained on, so a value not seen
+    # in training is predicted with every known value of that feature and
+    # the results averaged, rather than borrowing one category's estimate
+    grids = [
+        list(itertools.product(*(
+            _candidate_codes(feature_maps[feature], value)
+            for feature, value in zip(FEATURES, row)
+        )))
+        for row in rows
+    ]
+    features = pd.DataFrame(
+        [codes for grid in grids for codes in grid], columns=FEATURE_COLUMNS, dtype=np.int32
+    )
+    predictions = model.predict(features)
+    
+    sizes = np.array([len(grid) for grid in grids])
+    starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+    return np.add.reduceat(predictions, starts) / sizes
 
 def predict_salary(title, location, company):
     """
@@ -33,29 +116,16 @@ def predict_salary(title, location, company):
         dict: Predicted salary and confidence
     """
     try:
-        # Load model
-        model, label_encoders = load_model()
-        
-        # Encode the input features (convert text to numbers)
-        title_encoded = label_encoders['title'].transform([str(title)])[0]
-        location_encoded = label_encoders['location'].transform([str(location)])[0]
-        company_encoded = label_encoders['company'].transform([str(company)])[0]
-        
-        # Create input for prediction
-        input_data = pd.DataFrame({
-            'title_encoded': [title_encoded],
-            'location_encoded': [location_encoded],
-            'company_encoded': [company_encoded]
-        })
-        
-        # Make prediction
-        predicted_salary = model.predict(input_data)[0]
+        row = (title, location, company)
+        predicted_salary = predict_salaries([row])[0]
         
         return {
-            "predicted_salary": round(predicted_salary, 2),
+            "predicted_salary": round(float(predicted_salary), 2),
             "title": title,
             "location": location,
-            "company": company
+            "company": company,
+            # Features averaged over all known values because they were unseen
+            "unknown_features": unknown_features(row)
         }
     
     except Exception as e:
@@ -68,18 +138,25 @@ def get_model_stats():
     Get statistics about the trained model
     """
     try:
-        model, label_encoders = load_model()
-        
-        return {
-            "model_type": "Random Forest Regressor",
-            "features": ["title", "location", "company"],
-            "num_trees": model.n_estimators,
-            "trained_on_jobs": len(label_encoders['title'].classes_),
-            "unique_titles": len(label_encoders['title'].classes_),
-            "unique_locations": len(label_encoders['location'].classes_),
-            "unique_companies": len(label_encoders['company'].classes_)
-        }
+        return _model_stats()
     except Exception as e:
         return {
             "error": f"Could not load model stats: {str(e)}"
-        }
\ No newline at end of file
+        }
+
+@lru_cache(maxsize=1)
+def _model_stats():
+    """
+    Compute model statistics once; failures aren't cached so they're retried
+    """
+    model, feature_maps = load_model()
+    
+    return {
+        "model_type": "Random Forest Regressor",
+        "features": list(FEATURES),
+        "num_trees": model.n_estimators,
+        "trained_on_jobs": len(feature_maps['title']),
+        "unique_titles": len(feature_maps['title']),
+        "unique_locations": len(feature_maps['location']),
+        "unique_companies": len(feature_maps['company'])
+    }
@@ -1,10 +1,27 @@
 import pickle
 import os
+import threading
 
 MODEL_DIR = os.path.dirname(os.path.abspath(__file__))
 
+# Classifier and vectorizer, loaded from disk on first use and shared by all requests
+_classifier = None
+_vectorizer = None
+_classifier_lock = threading.Lock()
+
 def load_classifier():
-    """Load the trained classifier and vectorizer"""
+    """Load the trained classifier and vectorizer, reading the pickles only once"""
+    global _classifier, _vectorizer
+    
+    if _classifier is None:
+        with _classifier_lock:
+            if _classifier is None:
+                _classifier, _vectorizer = _read_classifier()
+    
+    return _classifier, _vectorizer
+
+def _read_classifier():
+    """Read the trained classifier and vectorizer from disk"""
     model_path = os.path.join(MODEL_DIR, 'job_classifier.pkl')
     vectorizer_path = os.path.join(MODEL_DIR, 'tfidf_vectorizer.pkl')
     
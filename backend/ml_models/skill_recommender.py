@@ -1,6 +1,8 @@
 import sys
 sys.path.append('..')
-from database import get_jobs_from_db
+import psycopg
+from database import count_skills
+import heapq
 
 # Common skills to look for in job descriptions
 SKILL_LIST = [
@@ -21,40 +23,31 @@ def get_skill_recommendations(target_role: str, top_n: int = 10):
     Output: ["python", "sql", "machine learning", ...]
     """
     try:
-        # Step 1: Get jobs matching target role
-        jobs = get_jobs_from_db(keyword=target_role, limit=200)
+        # Step 1: Count skill mentions across jobs matching the target role
+        skill_counts, jobs_analyzed = count_skills(SKILL_LIST, keyword=target_role)
         
-        if not jobs:
+        if not jobs_analyzed:
             return {"error": f"No jobs found for '{target_role}'"}
         
-        # Step 2: Count skill occurrences
-        skill_counts = {skill: 0 for skill in SKILL_LIST}
+        # Step 2: Pick the top N by count (most common first) without a full sort
+        sorted_skills = heapq.nlargest(top_n, skill_counts.items(), key=lambda x: x[1])
         
-        for job in jobs:
-            # Combine title + description
-            text = (job.get('title', '') + ' ' + job.get('description', '')).lower()
-            
-            # Count each skill
-            for skill in SKILL_LIST:
-                if skill in text:
-                    skill_counts[skill] += 1
-        
-        # Step 3: Sort by count (most common first)
-        sorted_skills = sorted(skill_counts.items(), key=lambda x: x[1], reverse=True)
-        
-        # Step 4: Get top N skills with counts > 0
+        # Step 3: Keep top skills with counts > 0
         top_skills = [
-            {"skill": skill, "frequency": count, "percentage": round(count/len(jobs)*100, 1)}
-            for skill, count in sorted_skills[:top_n]
+            {"skill": skill, "frequency": count, "percentage": round(count/jobs_analyzed*100, 1)}
+            for skill, count in sorted_skills
             if count > 0
         ]
         
         return {
             "target_role": target_role,
-            "jobs_analyzed": len(jobs),
+            "jobs_analyzed": jobs_analyzed,
             "recommended_skills": top_skills,
             "message": f"Top {len(top_skills)} skills for {target_role} roles"
         }
     
+    except psycopg.Error:
+        # Database failures are server errors, not a bad request
+        raise
     except Exception as e:
         return {"error": str(e)}
\ No newline at end of file
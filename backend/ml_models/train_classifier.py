@@ -13,7 +13,7 @@ def train_job_classifier():
     Train a model to classify jobs into categories
     """
     print("Step 1: Fetching jobs from database...")
-    jobs = get_jobs_from_db(limit=500)
+    jobs = get_jobs_from_db(limit=500, columns=('title', 'description'))
     
     if not jobs:
         print("Error: No jobs found!")
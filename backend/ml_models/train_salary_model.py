@@ -46,12 +46,13 @@ def train_salary_model():
     
     # Step 5: Encode text to numbers (ML needs numbers!)
     print("\nStep 5: Converting text to numbers...")
-    label_encoders = {}
+    feature_maps = {}
     
     for feature in features:
         le = LabelEncoder()
         df_clean[feature + '_encoded'] = le.fit_transform(df_clean[feature].astype(str))
-        label_encoders[feature] = le
+        # Save plain {value: code} dicts so prediction is a dict lookup
+        feature_maps[feature] = {cls: code for code, cls in enumerate(le.classes_)}
     
     # Step 6: Prepare training data
     print("\nStep 6: Splitting data into training and test sets...")
@@ -84,12 +85,12 @@ def train_salary_model():
         pickle.dump(model, f)
     
     with open('label_encoders.pkl', 'wb') as f:
-        pickle.dump(label_encoders, f)
+        pickle.dump(feature_maps, f)
     
     print("\n✓ Model saved successfully!")
     print(f"✓ Model can predict salaries with {test_score:.1%} accuracy")
     
-    return model, label_encoders
+    return model, feature_maps
 
 if __name__ == "__main__":
     train_salary_model()
@@ -1,9 +1,24 @@
 import pytest
 from fastapi.testclient import TestClient
+import main
 from main import app
 
 client = TestClient(app)
 
+@pytest.fixture(autouse=True)
+def fake_database(monkeypatch):
+    """Serve the database helpers from stubs so the API tests don't need Postgres"""
+    monkeypatch.setattr(main, "get_jobs_from_db", lambda *args, **kwargs: [])
+    monkeypatch.setattr(main, "iter_jobs_from_db", lambda *args, **kwargs: iter([]))
+    monkeypatch.setattr(main, "get_job_from_db", lambda job_id: None)
+    monkeypatch.setattr(main, "get_remote_jobs_from_db", lambda *args, **kwargs: [])
+    monkeypatch.setattr(main, "get_salary_stats_sql", lambda *args, **kwargs: None)
+    monkeypatch.setattr(main, "get_skill_counts", lambda limit: ([], 0))
+    monkeypatch.setattr(main, "get_company_counts", lambda *args, **kwargs: ([], 0))
+    monkeypatch.setattr(main, "get_location_counts", lambda *args, **kwargs: ([], 0))
+    monkeypatch.setattr(main, "get_job_timeseries", lambda *args, **kwargs: [])
+    main._AGG_CACHE.clear()
+
 def test_root():
     """Test root endpoint returns welcome message"""
     response = client.get("/")
@@ -45,3 +60,67 @@ def test_top_companies():
     response = client.get("/companies/hiring?limit=5")
     assert response.status_code == 200
     assert "companies" in response.json()
+
+def test_jobs_export():
+    """Test jobs export streams newline-delimited JSON"""
+    response = client.get("/jobs/export?keyword=data")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+
+def test_job_not_found():
+    """Test unknown job ID returns 404"""
+    response = client.get("/jobs/does-not-exist")
+    assert response.status_code == 404
+
+def test_best_locations():
+    """Test best locations endpoint"""
+    response = client.get("/locations/best?limit=5")
+    assert response.status_code == 200
+    assert "locations" in response.json()
+
+def test_etag_not_modified():
+    """Test repeating a GET with its ETag returns 304"""
+    response = client.get("/health")
+    etag = response.headers["etag"]
+    response = client.get("/health", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+def test_jobs_timeseries():
+    """Test jobs timeseries endpoint and interval validation"""
+    response = client.get("/jobs/timeseries?interval=week")
+    assert response.status_code == 200
+    assert "points" in response.json()
+    assert client.get("/jobs/timeseries?interval=hour").status_code == 400
+
+def test_gzip_large_responses():
+    """Test large responses are gzipped when the client accepts it"""
+    response = client.get("/openapi.json", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"].startswith('W/"')
+
+def test_aggregate_errors_not_cached(monkeypatch):
+    """Test a failed aggregate returns 500 and is not served from the cache"""
+    def unavailable(limit):
+        raise RuntimeError("database unavailable")
+    monkeypatch.setattr(main, "get_skill_counts", unavailable)
+    assert client.get("/skills/top?limit=3").status_code == 500
+    monkeypatch.setattr(main, "get_skill_counts", lambda limit: ([{"skill": "python", "count": 2}], 2))
+    response = client.get("/skills/top?limit=3")
+    assert response.status_code == 200
+    assert response.json()["skills"] == [{"skill": "python", "count": 2}]
+
+def test_job_lookup_database_error(monkeypatch):
+    """Test a database failure on job lookup is a 500, not a 404"""
+    def unavailable(job_id):
+        raise RuntimeError("database unavailable")
+    monkeypatch.setattr(main, "get_job_from_db", unavailable)
+    assert client.get("/jobs/some-id").status_code == 500
+
+def test_jobs_export_database_error(monkeypatch):
+    """Test an export whose query fails returns 500 instead of an empty stream"""
+    def unavailable(*args, **kwargs):
+        raise RuntimeError("database unavailable")
+        yield
+    monkeypatch.setattr(main, "iter_jobs_from_db", unavailable)
+    assert client.get("/jobs/export").status_code == 500
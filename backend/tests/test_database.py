@@ -0,0 +1,28 @@
+from datetime import datetime
+from database import _job_filters, _to_timestamp, _job_row, JOB_COLUMNS
+
+def test_job_filters_salary_bounds():
+    """Test salary bounds are applied in SQL rather than after fetching"""
+    where, params = _job_filters(min_salary=50000, max_salary=90000)
+    assert "salary_min >= %s" in where
+    assert "salary_min <= %s" in where
+    assert params == [50000, 90000]
+
+def test_job_filters_empty():
+    """Test no filters leaves the WHERE clause open"""
+    where, params = _job_filters()
+    assert where.strip() == "WHERE 1=1"
+    assert params == []
+
+def test_to_timestamp_utc():
+    """Test posting dates are stored as naive UTC and bad values as NULL"""
+    assert _to_timestamp("2026-01-15T10:23:45+02:00") == datetime(2026, 1, 15, 8, 23, 45)
+    assert _to_timestamp("2026-01-15T10:23:45Z") == datetime(2026, 1, 15, 10, 23, 45)
+    assert _to_timestamp("not a date") is None
+
+def test_job_row_keeps_missing_values_null():
+    """Test missing text fields are stored as NULL, not the string 'None'"""
+    row = dict(zip(JOB_COLUMNS, _job_row({"id": "1", "title": None, "original_url": None, "skills": None})))
+    assert row["title"] is None
+    assert row["original_url"] is None
+    assert row["skills"] == []
@@ -0,0 +1,57 @@
+from etl import (
+    extract_skills, remove_duplicates, transform_job,
+    build_skill_automaton, find_skills
+)
+
+def test_extract_skills_whole_words():
+    """Test short skills only match as whole words"""
+    skills = extract_skills("Great opportunity for our team", "Senior Developer")
+    assert "r" not in skills
+    assert "ai" not in skills
+
+def test_extract_skills_case_insensitive():
+    """Test skills are found regardless of case and returned lowercase"""
+    skills = extract_skills("Experience with Python and SQL", "Data Scientist")
+    assert "python" in skills
+    assert "sql" in skills
+
+def test_extract_skills_overlapping():
+    """Test overlapping skills are all reported once"""
+    skills = extract_skills("Google Cloud, cloud and C++ with CI/CD", "")
+    assert skills.count("cloud") == 1
+    assert "google cloud" in skills
+    assert "c++" in skills
+    assert "ci/cd" in skills
+
+def test_remove_duplicates():
+    """Test duplicate and ID-less jobs are removed, order is kept"""
+    jobs = [{"id": "2"}, {"id": "1"}, {"id": "2"}, {"title": "no id"}]
+    assert [job["id"] for job in remove_duplicates(jobs)] == ["2", "1"]
+
+def test_transform_job_missing_fields():
+    """Test jobs with missing or null fields are cleaned to the same shape"""
+    jobs = [
+        {"id": "1", "title": "Data Scientist", "description": "<p>Python &amp; SQL</p>",
+         "location": {"display_name": "London"}, "company": {"display_name": "Acme"},
+         "salary_min": 90000, "salary_max": 60000, "redirect_url": "http://x",
+         "created": "2026-01-15T10:23:45Z"},
+        {"id": "2", "title": "R Developer", "description": None,
+         "location": None, "company": None, "salary_min": 50000},
+        {"id": "3", "title": None, "description": "SQL", "redirect_url": None}
+    ]
+    cleaned = [transform_job(job) for job in jobs]
+    assert cleaned[0]["salary_min"] == 60000 and cleaned[0]["salary_max"] == 90000
+    assert cleaned[0]["skills"] == ["python", "sql"]
+    assert cleaned[1]["salary_avg"] == 50000 and cleaned[1]["description"] == ""
+    assert cleaned[2]["title"] == "" and cleaned[2]["original_url"] == ""
+
+def test_find_skills_custom_automaton():
+    """Test a custom skill automaton matches whole words only, at text edges too"""
+    automaton = build_skill_automaton(["r", "java", "machine learning"])
+    skills = find_skills("R and JavaScript for Machine Learning", automaton)
+    assert skills == ["r", "machine learning"]
+
+def test_extract_skills_covers_recommender():
+    """Test every recommended skill is stored by the ETL, since counts come from the skills array"""
+    from ml_models.skill_recommender import SKILL_LIST
+    assert set(extract_skills(" ".join(SKILL_LIST), "")) == set(SKILL_LIST)
@@ -0,0 +1,12 @@
+import numpy as np
+from ml_models.predict import load_model, predict_salaries, unknown_features
+
+def test_unknown_value_averages_known_values():
+    """Test an unseen title is predicted as the average over every known title"""
+    _, feature_maps = load_model()
+    location = next(iter(feature_maps['location']))
+    company = next(iter(feature_maps['company']))
+    known = predict_salaries([(title, location, company) for title in feature_maps['title']])
+    unknown = predict_salaries([("Chief Unicorn Officer", location, company)])
+    assert np.isclose(unknown[0], known.mean())
+    assert unknown_features(("Chief Unicorn Officer", location, company)) == ["title"]
@@ -1,7 +1,9 @@
 import streamlit as st
-import requests
+import asyncio
+import threading
+import aiohttp
+import orjson
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
 import os
 
@@ -20,6 +22,157 @@ def toggle_bookmark(job):
 # API Configuration
 API_BASE_URL = os.getenv("BACKEND_URL", "http://localhost:8000")
 
+# Plotly charts are built directly from graph_objects traces, skipping
+# plotly.express's DataFrame processing; the modebar logo is hidden
+PLOTLY_CONFIG = {'displaylogo': False, 'responsive': True}
+
+async def fetch(session, path, params):
+    """GET one API endpoint and return (status code, JSON body or None)"""
+    async with session.get(f"{API_BASE_URL}{path}", params=params) as response:
+        # orjson parses the raw bytes directly, skipping the text decode
+        data = orjson.loads(await response.read()) if response.status == 200 else None
+        return response.status, data
+
+@st.cache_resource
+def api_client():
+    """
+    One aiohttp session, with its event loop running on a background thread,
+    shared by every rerun and session so connections to the API are reused.
+    """
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    
+    async def open_session():
+        return aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=8, keepalive_timeout=30),
+            # Ask for compressed JSON; the API gzips larger responses and
+            # aiohttp decompresses them transparently
+            headers={"Accept-Encoding": "gzip, deflate"},
+            # Don't let a hung API freeze the script
+            timeout=aiohttp.ClientTimeout(total=10)
+        )
+    
+    session = asyncio.run_coroutine_threadsafe(open_session(), loop).result()
+    return loop, session
+
+def fetch_all(endpoints):
+    """Fetch all (path, params) endpoints concurrently over the shared session"""
+    loop, session = api_client()
+    
+    async def gather():
+        return await asyncio.gather(
+            *(fetch(session, path, params) for path, params in endpoints),
+            return_exceptions=True
+        )
+    
+    return asyncio.run_coroutine_threadsafe(gather(), loop).result()
+
+@st.cache_data(ttl=300, show_spinner=False)
+def load_market_data(search):
+    """
+    Fetch jobs, skills, salary stats and companies for a search, cached per
+    search parameters for 5 minutes and shared across sessions. Connection
+    failures raise, so they are never cached; callers clear results with
+    error statuses.
+    """
+    search = dict(search)
+    area = {"keyword": search["keyword"], "location": search["location"]}
+    endpoints = {
+        "jobs": ("/jobs/search", search),
+        "skills": ("/skills/top", {"limit": 15}),
+        "salaries": ("/salaries/stats", area),
+        "companies": ("/companies/hiring", {**area, "limit": 10}),
+        "trends": ("/jobs/timeseries", {**area, "interval": "day"})
+    }
+    responses = fetch_all(endpoints.values())
+    for response in responses:
+        if isinstance(response, Exception):
+            raise response
+    return dict(zip(endpoints, responses))
+
+@st.cache_resource
+def filter_options():
+    """Sidebar dropdown options, built once and shared by every rerun"""
+    locations = [
+        ("United States", "us"),
+        ("United Kingdom", "uk"),
+        ("Canada", "ca"),
+        ("Germany", "de"),
+        ("France", "fr"),
+        ("Australia", "au")
+    ]
+    return {
+        "titles": [
+            "data scientist",
+            "data analyst",
+            "machine learning engineer",
+            "data engineer",
+            "business analyst",
+            "AI engineer",
+            "research scientist"
+        ],
+        "locations": [name for name, _ in locations],
+        "location_codes": dict(locations)
+    }
+
+def get_result(results, name):
+    """Return (status code, data) for a fetched endpoint, re-raising its error"""
+    result = results[name]
+    if isinstance(result, Exception):
+        raise result
+    return result
+
+
+# Figures are cached on their DataFrame, so reruns with the same data
+# reuse the built figure instead of assembling it again
+@st.cache_data(show_spinner=False)
+def skills_chart(df_skills):
+    fig = go.Figure(go.Bar(
+        x=df_skills['skill'],
+        y=df_skills['count'],
+        marker_color='steelblue'
+    ))
+    fig.update_layout(
+        title='Top In-Demand Skills',
+        xaxis_title='Skill',
+        yaxis_title='Number of Jobs',
+        margin=dict(l=40, r=10, t=40, b=40),
+        uirevision='skills'
+    )
+    return fig
+
+@st.cache_data(show_spinner=False)
+def companies_chart(df_companies):
+    fig = go.Figure(go.Bar(
+        x=df_companies['job_count'],
+        y=df_companies['company'],
+        orientation='h',
+        marker_color='seagreen'
+    ))
+    fig.update_layout(
+        title='Top 10 Hiring Companies',
+        xaxis_title='Number of Jobs',
+        yaxis_title='Company',
+        uirevision='companies'
+    )
+    return fig
+
+@st.cache_data(show_spinner=False)
+def trends_chart(df_trends):
+    fig = go.Figure(go.Scattergl(
+        x=pd.to_datetime(df_trends['date']),
+        y=df_trends['job_count'],
+        mode='lines+markers',
+        line=dict(color='#1f77b4')
+    ))
+    fig.update_layout(
+        title='Jobs Posted Per Day',
+        xaxis_title='Date',
+        yaxis_title='Number of Jobs',
+        uirevision='trends'
+    )
+    return fig
+
 
 # Page Config
 st.set_page_config(
@@ -35,29 +188,11 @@ st.markdown("---")
 # Sidebar Filters
 st.sidebar.header("🔍 Search Filters")
 
-# Job title dropdown
-job_titles = [
-    "data scientist",
-    "data analyst", 
-    "machine learning engineer",
-    "data engineer",
-    "business analyst",
-    "AI engineer",
-    "research scientist"
-]
-keyword = st.sidebar.selectbox("Job Title", job_titles)
-
-# Location dropdown
-locations = [
-    ("United States", "us"),
-    ("United Kingdom", "uk"),
-    ("Canada", "ca"),
-    ("Germany", "de"),
-    ("France", "fr"),
-    ("Australia", "au")
-]
-location_display = st.sidebar.selectbox("Location", [loc[0] for loc in locations])
-location = dict(locations)[location_display]
+options = filter_options()
+keyword = st.sidebar.selectbox("Job Title", options["titles"])
+
+location_display = st.sidebar.selectbox("Location", options["locations"])
+location = options["location_codes"][location_display]
 
 min_salary = st.sidebar.number_input("Minimum Salary ($)", min_value=0, value=0, step=10000)
 max_salary = st.sidebar.number_input("Maximum Salary ($)", min_value=0, value=200000, step=10000)
@@ -65,54 +200,75 @@ limit = st.sidebar.slider("Number of Results", min_value=5, max_value=50, value=
 
 search_button = st.sidebar.button("🔍 Search Jobs", type="primary")
 
+# Only filters moved off their defaults are sent to the API. The frozenset
+# is hashable, so it doubles as the cache key for load_market_data.
+search_params = {"keyword": keyword, "location": location, "limit": limit}
+if min_salary > 0:
+    search_params["min_salary"] = min_salary
+if max_salary < 200000:
+    search_params["max_salary"] = max_salary
+current_query = frozenset(search_params.items())
+
+# Fetch every tab's data at once so the waits overlap. Results are kept in
+# session state so tab switches and other reruns render without refetching;
+# changing the filters after a search fetches the new results.
+if search_button or ("results" in st.session_state and st.session_state.get("query") != current_query):
+    try:
+        with st.spinner("Loading job market data..."):
+            results = load_market_data(current_query)
+        # Keep error responses out of the cache so searching again retries
+        if any(status != 200 for status, _ in results.values()):
+            load_market_data.clear(current_query)
+    except Exception as e:
+        # Let each tab report the failure
+        results = dict.fromkeys(["jobs", "skills", "salaries", "companies", "trends"], e)
+    st.session_state.update(results=results, query=current_query)
+
 # Main Content Tabs
-tab1, tab2, tab3, tab4, tab5 = st.tabs(["📋 Job Listings", "📊 Skills Analysis", "💰 Salary Stats", "🏢 Top Companies", "⭐ Bookmarks"])
+tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs(["📋 Job Listings", "📊 Skills Analysis", "💰 Salary Stats", "🏢 Top Companies", "📈 Posting Trends", "⭐ Bookmarks"])
 
 # Tab 1: Job Listings
-with tab1:
-    if search_button:
+@st.fragment
+def jobs_tab():
+    results = st.session_state.get("results")
+    if results:
         try:
-            # Fetch jobs from API
-            with st.spinner("Searching jobs..."):
-                response = requests.get(
-                    f"{API_BASE_URL}/jobs/search",
-                    params={
-                        "keyword": keyword,
-                        "location": location,
-                        "min_salary": min_salary if min_salary > 0 else None,
-                        "max_salary": max_salary if max_salary < 200000 else None,
-                        "limit": limit
-                    }
-                )
+            status, data = get_result(results, "jobs")
             
-            if response.status_code == 200:
-                data = response.json()
+            if status == 200:
                 jobs = data.get("jobs", [])
                 
                 if jobs:
                     st.success(f"Found {len(jobs)} jobs matching your criteria")
                     
-                    # Display each job
-                    for job in jobs:
-                        with st.expander(f"{job.get('title', 'N/A')} - {job.get('company', 'N/A')}"):
-                            col1, col2 = st.columns([2, 1])
-                            
-                            with col1:
-                                st.write(f"**Location:** {job.get('location', 'N/A')}")
-                                st.write(f"**Description:** {job.get('description', 'N/A')[:300]}...")
-                                
-                            with col2:
-                                st.metric("Min Salary", f"${job.get('salary_min', 0):,}")
-                                st.metric("Max Salary", f"${job.get('salary_max', 0):,}")
-                                
-                            if job.get('skills'):
-                                st.write(f"**Skills:** {job.get('skills')}")
+                    # One virtualized table instead of a set of widgets per job
+                    df_jobs = pd.DataFrame.from_records(
+                        jobs, columns=['title', 'company', 'location', 'salary_min', 'salary_max', 'skills', 'description']
+                    )
+                    # Fill gaps and shorten descriptions column-wise
+                    df_jobs[['title', 'company', 'location']] = df_jobs[['title', 'company', 'location']].fillna('N/A')
+                    df_jobs['description'] = df_jobs['description'].fillna('N/A').str.slice(0, 300)
+                    df_jobs[['salary_min', 'salary_max']] = df_jobs[['salary_min', 'salary_max']].fillna(0).astype('int64')
+                    st.dataframe(
+                        df_jobs,
+                        use_container_width=True,
+                        hide_index=True,
+                        column_config={
+                            'title': 'Title',
+                            'company': 'Company',
+                            'location': 'Location',
+                            'salary_min': st.column_config.NumberColumn('Min Salary', format='$%d'),
+                            'salary_max': st.column_config.NumberColumn('Max Salary', format='$%d'),
+                            'skills': st.column_config.ListColumn('Skills'),
+                            'description': st.column_config.TextColumn('Description', width='large')
+                        }
+                    )
                 else:
                     st.warning("No jobs found. Try different search criteria or refresh database.")
             else:
-                st.error(f"API Error: {response.status_code}")
+                st.error(f"API Error: {status}")
                 
-        except requests.exceptions.ConnectionError:
+        except aiohttp.ClientConnectionError:
             st.error("❌ Cannot connect to backend API!")
             st.info("Make sure FastAPI is running: `uvicorn main:app --reload`")
         except Exception as e:
@@ -120,52 +276,57 @@ with tab1:
     else:
         st.info("👈 Click 'Search Jobs' button to see results")
 
+with tab1:
+    jobs_tab()
+
 # Tab 2: Skills Analysis
-with tab2:
-    if search_button:
+@st.fragment
+def skills_tab():
+    results = st.session_state.get("results")
+    if results:
         try:
-            with st.spinner("Analyzing skills..."):
-                response = requests.get(f"{API_BASE_URL}/skills/top", params={"limit": 15})
+            status, data = get_result(results, "skills")
             
-            if response.status_code == 200:
-                data = response.json()
+            if status == 200:
                 skills = data.get("skills", [])
                 
                 if skills:
-                    # Create DataFrame
-                    df_skills = pd.DataFrame(skills)
+                    # Create DataFrame with known columns and compact counts
+                    df_skills = pd.DataFrame.from_records(skills, columns=['skill', 'count'])
+                    df_skills['count'] = df_skills['count'].astype('int32')
                     
-                    # Bar chart
-                    fig = px.bar(
-                        df_skills, 
-                        x='skill', 
-                        y='count',
-                        title='Top In-Demand Skills',
-                        labels={'skill': 'Skill', 'count': 'Number of Jobs'},
-                        color='count',
-                        color_continuous_scale='Blues'
+                    # One table with in-cell bars; the full chart is opt-in
+                    # and toggling it only reruns this tab
+                    st.dataframe(
+                        df_skills,
+                        use_container_width=True,
+                        hide_index=True,
+                        column_config={
+                            'skill': 'Skill',
+                            'count': st.column_config.ProgressColumn(
+                                'Number of Jobs', format='%d', min_value=0, max_value=int(df_skills['count'].max())
+                            )
+                        }
                     )
-                    st.plotly_chart(fig, use_container_width=True)
-                    
-                    # Show table
-                    st.dataframe(df_skills, use_container_width=True)
+                    if st.toggle("Show chart", key="skills_chart"):
+                        st.plotly_chart(skills_chart(df_skills), use_container_width=True, config=PLOTLY_CONFIG)
         except Exception as e:
             st.error(f"Error: {str(e)}")
     else:
         st.info("👈 Click 'Search Jobs' to see skills analysis")
 
+with tab2:
+    skills_tab()
+
 # Tab 3: Salary Statistics
-with tab3:
-    if search_button:
+@st.fragment
+def salary_tab():
+    results = st.session_state.get("results")
+    if results:
         try:
-            with st.spinner("Calculating salaries..."):
-                response = requests.get(
-                    f"{API_BASE_URL}/salaries/stats",
-                    params={"keyword": keyword, "location": location}
-                )
+            status, data = get_result(results, "salaries")
             
-            if response.status_code == 200:
-                data = response.json()
+            if status == 200:
                 
                 if "message" not in data:
                     # Display metrics
@@ -188,57 +349,93 @@ with tab3:
     else:
         st.info("👈 Click 'Search Jobs' to see salary stats")
 
+with tab3:
+    salary_tab()
+
 # Tab 4: Top Companies
-with tab4:
-    if search_button:
+@st.fragment
+def companies_tab():
+    results = st.session_state.get("results")
+    if results:
         try:
-            with st.spinner("Finding top companies..."):
-                response = requests.get(
-                    f"{API_BASE_URL}/companies/hiring",
-                    params={"keyword": keyword, "location": location, "limit": 10}
-                )
+            status, data = get_result(results, "companies")
             
-            if response.status_code == 200:
-                data = response.json()
+            if status == 200:
                 companies = data.get("companies", [])
                 
                 if companies:
-                    # Create DataFrame
-                    df_companies = pd.DataFrame(companies)
+                    # Create DataFrame with known columns and compact counts
+                    df_companies = pd.DataFrame.from_records(companies, columns=['company', 'job_count'])
+                    df_companies['job_count'] = df_companies['job_count'].astype('int32')
                     
-                    # Horizontal bar chart
-                    fig = px.bar(
+                    # One table with in-cell bars; the full chart is opt-in
+                    # and toggling it only reruns this tab
+                    st.dataframe(
                         df_companies,
-                        x='job_count',
-                        y='company',
-                        orientation='h',
-                        title='Top 10 Hiring Companies',
-                        labels={'job_count': 'Number of Jobs', 'company': 'Company'},
-                        color='job_count',
-                        color_continuous_scale='Greens'
+                        use_container_width=True,
+                        hide_index=True,
+                        column_config={
+                            'company': 'Company',
+                            'job_count': st.column_config.ProgressColumn(
+                                'Number of Jobs', format='%d', min_value=0, max_value=int(df_companies['job_count'].max())
+                            )
+                        }
                     )
-                    st.plotly_chart(fig, use_container_width=True)
-                    
-                    # Show table
-                    st.dataframe(df_companies, use_container_width=True)
+                    if st.toggle("Show chart", key="companies_chart"):
+                        st.plotly_chart(companies_chart(df_companies), use_container_width=True, config=PLOTLY_CONFIG)
         except Exception as e:
             st.error(f"Error: {str(e)}")
     else:
         st.info("👈 Click 'Search Jobs' to see top companies")
 
-# Tab 5: Bookmarks
+with tab4:
+    companies_tab()
+
+# Tab 5: Posting Trends
+@st.fragment
+def trends_tab():
+    results = st.session_state.get("results")
+    if results:
+        try:
+            status, data = get_result(results, "trends")
+            
+            if status == 200:
+                points = data.get("points", [])
+                
+                if points:
+                    # Counts are aggregated per posting day by the API, so the
+                    # chart gets one point per day rather than one per job
+                    df_trends = pd.DataFrame.from_records(points, columns=['date', 'job_count'])
+                    st.plotly_chart(trends_chart(df_trends), use_container_width=True, config=PLOTLY_CONFIG)
+                else:
+                    st.warning("No posting history available")
+        except Exception as e:
+            st.error(f"Error: {str(e)}")
+    else:
+        st.info("👈 Click 'Search Jobs' to see posting trends")
+
 with tab5:
+    trends_tab()
+
+# Tab 6: Bookmarks
+@st.fragment
+def bookmarks_tab():
     if st.session_state.bookmarks:
         st.success(f"You have {len(st.session_state.bookmarks)} bookmarked jobs")
         for job in st.session_state.bookmarks:
             with st.expander(f"⭐ {job.get('title', 'N/A')} - {job.get('company', 'N/A')}"):
-                st.write(f"**Location:** {job.get('location', 'N/A')}")
-                st.write(f"**Description:** {job.get('description', 'N/A')[:200]}...")
+                st.markdown(
+                    f"**Location:** {job.get('location', 'N/A')}\n\n"
+                    f"**Description:** {job.get('description', 'N/A')[:200]}..."
+                )
                 if st.button("Remove Bookmark", key=f"remove_{job.get('id') or job.get('title')}"):
                     toggle_bookmark(job)
                     st.rerun()
     else:
         st.info("No bookmarked jobs yet. Click ⭐ on any job to bookmark it.")
+
+with tab6:
+    bookmarks_tab()
 # Footer
 st.markdown("---")
 st.markdown("**Job Market Analyzer** | Built with Streamlit & FastAPI")
\ No newline at end of file